@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+#
+"""Measure the speed of the spelling builder and its filters.
+
+A synthetic Sphinx project is generated with a configurable number of
+documents and vocabulary, and then the main stages of checking it are
+timed separately. The results are written as JSON so they can be
+saved and compared between releases.
+"""
+
+import argparse
+import contextlib
+import importlib.metadata
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+import enchant
+import sphinx
+from enchant.tokenize import EmailFilter, WikiWordFilter, get_tokenizer
+from sphinx.application import Sphinx
+
+from sphinxcontrib.spelling import checker, filters
+
+# Common words that are in every English dictionary.
+COMMON_WORDS = [
+    "the",
+    "of",
+    "and",
+    "to",
+    "in",
+    "is",
+    "was",
+    "he",
+    "for",
+    "it",
+    "with",
+    "as",
+    "his",
+    "on",
+    "be",
+    "at",
+    "by",
+    "had",
+    "are",
+    "but",
+    "from",
+    "or",
+    "have",
+    "an",
+    "they",
+    "which",
+    "one",
+    "you",
+    "were",
+    "all",
+    "her",
+    "she",
+    "there",
+    "would",
+    "their",
+    "we",
+    "him",
+    "been",
+    "has",
+    "when",
+    "who",
+    "will",
+    "no",
+    "more",
+    "if",
+    "out",
+    "so",
+    "up",
+    "said",
+    "what",
+    "its",
+    "about",
+    "than",
+    "into",
+    "them",
+    "can",
+    "only",
+    "other",
+    "time",
+    "new",
+    "some",
+    "could",
+    "these",
+    "two",
+    "may",
+    "first",
+    "then",
+    "do",
+    "any",
+    "like",
+    "my",
+    "now",
+    "over",
+    "such",
+    "our",
+    "man",
+    "me",
+    "even",
+    "most",
+    "made",
+    "after",
+    "also",
+    "did",
+    "many",
+    "before",
+    "must",
+    "through",
+    "back",
+    "years",
+    "where",
+    "much",
+    "your",
+    "way",
+    "well",
+    "down",
+    "should",
+    "because",
+    "each",
+    "just",
+    "those",
+    "people",
+    "how",
+    "too",
+    "little",
+    "state",
+    "good",
+    "very",
+    "make",
+    "world",
+    "still",
+    "own",
+    "see",
+    "men",
+    "work",
+    "long",
+    "get",
+    "here",
+    "between",
+    "both",
+    "life",
+    "being",
+    "under",
+    "never",
+    "day",
+    "same",
+    "another",
+    "know",
+    "while",
+    "last",
+    "might",
+    "us",
+    "great",
+    "old",
+    "year",
+    "off",
+    "come",
+    "since",
+    "against",
+    "go",
+    "came",
+    "right",
+    "used",
+    "take",
+    "three",
+    "document",
+    "build",
+    "project",
+    "change",
+    "number",
+    "value",
+    "section",
+    "example",
+    "function",
+    "return",
+    "module",
+    "package",
+    "file",
+]
+
+# Words that the filters are meant to ignore.
+SPECIAL_WORDS = [
+    "can't",
+    "doesn't",
+    "we'll",
+    "someone@example.com",
+    "WikiWord",
+    "CamelCase",
+    "HTML",
+    "URLs",
+    "len",
+    "isinstance",
+    "os",
+    "json",
+    "os.path",
+    "collections.abc",
+    "requests",
+]
+
+
+def make_vocabulary(size, rng):
+    "Returns size random words that are unlikely to be in the dictionary."
+    words = set()
+    while len(words) < size:
+        length = rng.randint(4, 10)
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return sorted(words)
+
+
+def make_paragraph(rng, words, vocabulary, misspelled_rate, special_rate):
+    parts = []
+    for _ in range(words):
+        r = rng.random()
+        if vocabulary and r < misspelled_rate:
+            parts.append(rng.choice(vocabulary))
+        elif r < misspelled_rate + special_rate:
+            parts.append(rng.choice(SPECIAL_WORDS))
+        else:
+            parts.append(rng.choice(COMMON_WORDS))
+    # Wrap the text like a human would, so the line numbers matter.
+    lines = []
+    for i in range(0, len(parts), 12):
+        lines.append(" ".join(parts[i : i + 12]))
+    return "\n".join(lines).capitalize() + "."
+
+
+def make_project(srcdir, args):
+    "Write a synthetic Sphinx project to srcdir."
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    docnames = [f"doc{i:05d}" for i in range(args.documents)]
+
+    with open(os.path.join(srcdir, "conf.py"), "w", encoding="utf-8") as f:
+        f.write("extensions = ['sphinxcontrib.spelling']\n")
+        f.write("spelling_ignore_pypi_package_names = True\n")
+        f.write("spelling_pypi_package_names_filename = 'pypi-names.txt'\n")
+        f.write("spelling_ignore_contributor_names = False\n")
+    with open(os.path.join(srcdir, "pypi-names.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(["requests", "sphinx"] + vocabulary[::10]))
+        f.write("\n")
+    with open(
+        os.path.join(srcdir, "spelling_wordlist.txt"), "w", encoding="utf-8"
+    ) as f:
+        f.write("\n".join(vocabulary[1::10]))
+        f.write("\n")
+
+    with open(os.path.join(srcdir, "index.rst"), "w", encoding="utf-8") as f:
+        f.write("Benchmark\n=========\n\n.. toctree::\n\n")
+        f.writelines(f"   {docname}\n" for docname in docnames)
+
+    texts = []
+    for docname in docnames:
+        with open(os.path.join(srcdir, docname + ".rst"), "w", encoding="utf-8") as f:
+            title = f"Document {docname}"
+            f.write(f"{title}\n{'=' * len(title)}\n\n")
+            for _ in range(args.paragraphs):
+                text = make_paragraph(
+                    rng,
+                    args.words,
+                    vocabulary,
+                    args.misspelled_rate,
+                    args.special_rate,
+                )
+                texts.append(text)
+                f.write(text + "\n\n")
+    return docnames, texts
+
+
+def measure(func, repeat, setup=None):
+    """Call func repeat times and return the elapsed times and last result.
+
+    If setup is given, it is called before each run, outside of the
+    timing, and its result is passed to func.
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        args = () if setup is None else (setup(),)
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def report(name, times, items=None, unit=None, **extra):
+    "Returns a dictionary describing the results of one benchmark."
+    result = {
+        "name": name,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+    if items is not None:
+        result["items"] = items
+        result["unit"] = unit
+        result["rate"] = items / result["min"] if result["min"] else None
+    result.update(extra)
+    print(
+        f"{name:<40} {result['min'] * 1000:12.3f} ms",
+        f"({items} {unit})" if items is not None else "",
+        file=sys.stderr,
+    )
+    return result
+
+
+def bench_builder(srcdir, outdir, docnames, args):
+    "Time the parts of the builder using a real Sphinx application."
+    results = []
+    app = Sphinx(
+        srcdir,
+        srcdir,
+        outdir,
+        os.path.join(outdir, ".doctrees"),
+        "spelling",
+        status=io.StringIO(),
+        warning=io.StringIO(),
+        freshenv=True,
+    )
+    # Read the documents and check them once, so the environment and
+    # the doctrees are ready.
+    app.build()
+    builder = app.builder
+
+    times, _ = measure(builder.init, args.repeat)
+    results.append(report("builder.init", times))
+
+    doctrees = {docname: builder._get_doctree(docname) for docname in docnames}
+
+    def reset():
+        # Start with a new checker each time, so words remembered by
+        # the earlier runs do not make the later ones faster.
+        builder.init()
+        return builder
+
+    def find_all(builder):
+        count = 0
+        for docname, doctree in doctrees.items():
+            for _ in builder._find_misspellings(docname, doctree):
+                count += 1
+        return count
+
+    times, count = measure(find_all, args.repeat, setup=reset)
+    results.append(
+        report(
+            "builder._find_misspellings",
+            times,
+            items=len(docnames),
+            unit="documents",
+            misspellings=count,
+        )
+    )
+    return results
+
+
+def bench_checker(srcdir, texts, args):
+    "Time SpellingChecker.check() on its own."
+    nwords = sum(len(text.split()) for text in texts)
+
+    def make_checker():
+        return checker.SpellingChecker(
+            lang="en_US",
+            suggest=True,
+            word_list_filename=os.path.join(srcdir, "spelling_wordlist.txt"),
+            tokenizer_lang=args.tokenizer_lang,
+            filters=[filters.ContractionFilter, EmailFilter],
+            tokenizer_engine=args.tokenizer_engine,
+        )
+
+    def check_all(spelling_checker):
+        count = 0
+        for text in texts:
+            for _ in spelling_checker.check(text):
+                count += 1
+        return count
+
+    times, count = measure(check_all, args.repeat, setup=make_checker)
+    return [
+        report(
+            "SpellingChecker.check",
+            times,
+            items=nwords,
+            unit="words",
+            misspellings=count,
+        )
+    ]
+
+
+def get_filters(srcdir, cachedir):
+    "Returns the names and factories of the filters to time."
+    with open(os.path.join(srcdir, "spelling_wordlist.txt"), encoding="utf-8") as f:
+        words = f.read().split()
+    return [
+        ("no filters", None),
+        ("ContractionFilter", filters.ContractionFilter),
+        ("EmailFilter", EmailFilter),
+        ("WikiWordFilter", WikiWordFilter),
+        ("AcronymFilter", filters.AcronymFilter),
+        ("IgnoreWordsFilter", filters.IgnoreWordsFilterFactory(words)),
+        (
+            "PyPIFilter",
+            lambda tokenizer: filters.PyPIFilterFactory(
+                names_filename=os.path.join(srcdir, "pypi-names.txt")
+            )(tokenizer),
+        ),
+        ("PythonBuiltinsFilter", filters.PythonBuiltinsFilter),
+        ("ImportableModuleFilter", filters.ImportableModuleFilter),
+        (
+            "ImportableModuleFilter (indexed)",
+            lambda tokenizer: filters.ImportableModuleFilterFactory(
+                cache_filename=os.path.join(cachedir, "modules.wordset")
+            )(tokenizer),
+        ),
+        (
+            "ContributorFilter",
+            lambda tokenizer: filters.ContributorFilterFactory(
+                cache_filename=os.path.join(cachedir, "contributors.json")
+            )(tokenizer),
+        ),
+    ]
+
+
+def bench_filters(srcdir, cachedir, texts, args):
+    "Time building and running a tokenizer with each filter alone."
+    results = []
+    text = "\n".join(texts)
+    nwords = len(text.split())
+    for name, filter_ in get_filters(srcdir, cachedir):
+        filter_list = [] if filter_ is None else [filter_]
+
+        times, tokenizer = measure(
+            lambda filter_list=filter_list: get_tokenizer(
+                args.tokenizer_lang, filters=filter_list
+            ),
+            args.repeat,
+        )
+        results.append(report(f"filter: {name}: construct", times))
+
+        times, count = measure(
+            lambda tokenizer=tokenizer: sum(1 for _ in tokenizer(text)),
+            args.repeat,
+        )
+        results.append(
+            report(
+                f"filter: {name}: tokenize",
+                times,
+                items=nwords,
+                unit="words",
+                tokens=count,
+            )
+        )
+
+    # The default filters of the builder, wrapped around a tokenizer
+    # one at a time and applied together by a FilterChain.
+    default_filters = [
+        filters.ContractionFilter,
+        EmailFilter,
+        WikiWordFilter,
+        filters.AcronymFilter,
+        filters.PythonBuiltinsFilter,
+    ]
+    for name, make_tokenizer in (
+        (
+            "wrapped",
+            lambda: get_tokenizer(args.tokenizer_lang, filters=default_filters),
+        ),
+        (
+            "FilterChain",
+            lambda: filters.FilterChain.from_filters(
+                args.tokenizer_lang, default_filters
+            ),
+        ),
+    ):
+        tokenizer = make_tokenizer()
+        times, count = measure(
+            lambda tokenizer=tokenizer: sum(1 for _ in tokenizer(text)), args.repeat
+        )
+        results.append(
+            report(
+                f"default filters: {name}: tokenize",
+                times,
+                items=nwords,
+                unit="words",
+                tokens=count,
+            )
+        )
+    return results
+
+
+def main(args=sys.argv[1:]):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=50, help="number of documents")
+    parser.add_argument(
+        "--paragraphs", type=int, default=20, help="paragraphs per document"
+    )
+    parser.add_argument("--words", type=int, default=80, help="words per paragraph")
+    parser.add_argument(
+        "--vocabulary",
+        type=int,
+        default=2000,
+        help="number of distinct words that are not in the dictionary",
+    )
+    parser.add_argument(
+        "--misspelled-rate",
+        type=float,
+        default=0.02,
+        help="fraction of words taken from the misspelled vocabulary",
+    )
+    parser.add_argument(
+        "--special-rate",
+        type=float,
+        default=0.05,
+        help="fraction of words the filters are expected to ignore",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of times to run each test"
+    )
+    parser.add_argument("--tokenizer-lang", default="en_US")
+    parser.add_argument(
+        "--tokenizer-engine",
+        choices=["enchant", "regex"],
+        default="enchant",
+        help="how the checker splits words",
+    )
+    parser.add_argument(
+        "--only",
+        choices=["builder", "checker", "filters"],
+        action="append",
+        help="only run some of the benchmarks (may be repeated)",
+    )
+    parser.add_argument(
+        "--output", "-o", help="write the JSON results to a file instead of stdout"
+    )
+    parser.add_argument(
+        "--keep", help="generate the project in this directory and keep it"
+    )
+    parsed = parser.parse_args(args)
+    only = set(parsed.only or ["builder", "checker", "filters"])
+
+    with contextlib.ExitStack() as stack:
+        workdir = parsed.keep
+        if workdir is None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory())
+        srcdir = os.path.join(workdir, "src")
+        outdir = os.path.join(workdir, "out")
+        cachedir = os.path.join(workdir, "cache")
+        for dirname in (srcdir, outdir, cachedir):
+            os.makedirs(dirname, exist_ok=True)
+
+        print(f"generating project in {srcdir}", file=sys.stderr)
+        docnames, texts = make_project(srcdir, parsed)
+
+        results = []
+        if "builder" in only:
+            results.extend(bench_builder(srcdir, outdir, docnames, parsed))
+        if "checker" in only:
+            results.extend(bench_checker(srcdir, texts, parsed))
+        if "filters" in only:
+            results.extend(bench_filters(srcdir, cachedir, texts, parsed))
+
+    output = {
+        "sphinxcontrib-spelling": importlib.metadata.version("sphinxcontrib-spelling"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "sphinx": sphinx.__display_version__,
+        "enchant": enchant.get_enchant_version(),
+        "parameters": {
+            name: value
+            for name, value in vars(parsed).items()
+            if name not in ("output", "keep")
+        },
+        "results": results,
+    }
+    if parsed.output:
+        with open(parsed.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,6 +39,10 @@ def setup(app):
     app.add_config_value("spelling_word_list_filename", None, "env")
     # Assume anything that looks like a PyPI package name is spelled properly
     app.add_config_value("spelling_ignore_pypi_package_names", False, "env")
+    # Reuse the list of PyPI package names for this many seconds
+    app.add_config_value("spelling_pypi_cache_ttl", 86400, "env")
+    # Read the PyPI package names from a file instead of the network
+    app.add_config_value("spelling_pypi_package_names_filename", None, "env")
     # Assume words that look like wiki page names are spelled properly
     app.add_config_value("spelling_ignore_wiki_words", True, "env")
     # Assume words that are all caps, or all caps with trailing s, are
@@ -58,6 +62,29 @@ def setup(app):
     # Choose whether or not the misspelled output should be displayed
     # in the terminal
     app.add_config_value("spelling_verbose", True, "env")
+    # Remember the verdicts of the dictionary between builds
+    app.add_config_value("spelling_verdict_cache", False, "")
+    # Limit the number of dictionary answers remembered during a build
+    app.add_config_value("spelling_memo_size", 10000, "")
+    # Set the directory for data saved between builds
+    app.add_config_value("spelling_cache_dir", None, "")
+    # Choose how suggestions are found ("backend" or "symspell")
+    app.add_config_value("spelling_suggestion_engine", "backend", "env")
+    # Choose how text is split into words ("enchant" or "regex")
+    app.add_config_value("spelling_tokenizer_engine", "enchant", "env")
+    # Choose the library used to look words up ("enchant" or "memory")
+    app.add_config_value("spelling_backend", "enchant", "env")
+    # Set the Hunspell dictionary or word list used by the memory backend
+    app.add_config_value("spelling_dictionary_filename", None, "env")
+    # Write one consolidated report ("jsonl" or "sarif") instead of a
+    # file per document ("text")
+    app.add_config_value("spelling_output_format", "text", "env")
+    # Check documents using a pool of threads in serial builds
+    app.add_config_value("spelling_check_threads", 1, "")
+    # Report where the time is spent during a build
+    app.add_config_value("spelling_profile", False, "")
+    # Set the name of a file in the output directory to save the profile in
+    app.add_config_value("spelling_profile_filename", None, "")
     return {
         "parallel_read_safe": True,
         "parallel_write_safe": True,
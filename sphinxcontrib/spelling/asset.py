@@ -5,6 +5,7 @@
 
 import collections
 import contextlib
+import sys
 
 from sphinx.environment.collectors import EnvironmentCollector
 from sphinx.util import logging
@@ -13,6 +14,27 @@ logger = logging.getLogger(__name__)
 
 
 class SpellingCollector(EnvironmentCollector):
+    """Collect the good words listed in each document.
+
+    The spelling:word-list directive and spelling:word role add words
+    to a list for the document as it is read. When the document has
+    been read, the list is replaced with a frozen set of the distinct
+    words, ready for the builder to use, so duplicates are not kept in
+    the saved environment.
+
+    The words are interned, so a word listed in many documents is
+    only kept, and pickled, once. Documents listing the same words
+    share a single set.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._word_sets = {}
+
+    def _compact(self, words):
+        words = frozenset(sys.intern(word) for word in words if word)
+        return self._word_sets.setdefault(words, words)
+
     def clear_doc(self, app, env, docname) -> None:
         with contextlib.suppress(AttributeError, KeyError):
             del env.spelling_document_words[docname]
@@ -25,7 +47,21 @@ class SpellingCollector(EnvironmentCollector):
 
         if not hasattr(env, "spelling_document_words"):
             env.spelling_document_words = collections.defaultdict(list)
-        env.spelling_document_words.update(other_words)
+        # The sets were made by the worker process, so compact them
+        # again to share the strings and sets with the other documents.
+        for docname in docnames:
+            words = other_words.get(docname)
+            if words:
+                env.spelling_document_words[docname] = self._compact(words)
 
     def process_doc(self, app, doctree):
-        pass
+        env = app.env
+        document_words = getattr(env, "spelling_document_words", {})
+        words = document_words.get(env.docname)
+        if words is None:
+            return
+        words = self._compact(words)
+        if words:
+            document_words[env.docname] = words
+        else:
+            del document_words[env.docname]
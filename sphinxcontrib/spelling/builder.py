@@ -4,17 +4,32 @@
 """Spelling checker extension for Sphinx."""
 
 import collections
+import concurrent.futures
+import contextlib
+import hashlib
 import importlib
+import importlib.metadata
+import json
 import os
-import tempfile
+import time
 
 import docutils.nodes
 import docutils.utils
+import sphinx
 from sphinx.builders import Builder
+from sphinx.errors import ConfigError
 from sphinx.util import logging, osutil
+from sphinx.util.build_phase import BuildPhase
 from sphinx.util.console import red
 from sphinx.util.matching import Matcher
 from sphinx.util.osutil import ensuredir
+from sphinx.util.parallel import ParallelTasks, make_chunks
+
+try:
+    from sphinx.util.display import status_iterator
+except ImportError:
+    # Sphinx < 6.1
+    from sphinx.util import status_iterator
 
 try:
     from enchant.tokenize import EmailFilter, WikiWordFilter
@@ -23,12 +38,28 @@ except ImportError as imp_exc:
 else:
     enchant_import_error = None
 
-from . import checker, filters
+from . import cache, checker, filters, profile, report, symspell
 
 logger = logging.getLogger(__name__)
 
 # TODO - Words with multiple uppercase letters treated as classes and ignored
 
+# Name of the file in the output directory used to remember the
+# results of earlier builds, and the version of its format.
+STATE_FILENAME = ".spelling-state.json"
+STATE_VERSION = 1
+
+# Configuration settings that change how a build runs, but not its
+# results, and so are not part of the checker signature.
+UNSIGNED_CONFIG = {
+    "spelling_profile",
+    "spelling_profile_filename",
+    "spelling_check_threads",
+    "spelling_verdict_cache",
+    "spelling_memo_size",
+    "spelling_cache_dir",
+}
+
 
 class SpellingBuilder(Builder):
     """
@@ -37,12 +68,32 @@ class SpellingBuilder(Builder):
 
     name = "spelling"
 
+    # Writing in parallel is handled by write_documents(), which is
+    # only used by Sphinx 8.1 and later.
+    allow_parallel = hasattr(Builder, "write_documents")
+
     def init(self):
         if enchant_import_error is not None:
             raise RuntimeError(
                 "Cannot initialize spelling builder without PyEnchant installed"
             ) from enchant_import_error
         self.misspelling_count = 0
+        self.profile = profile.Profile() if self.config.spelling_profile else None
+
+        # Consolidated reports collect the records of each document
+        # checked during the build, and are written by finish().
+        self.report = None
+        self.report_records = {}
+        output_format = self.config.spelling_output_format
+        if output_format != "text":
+            try:
+                report_class = report.FORMATS[output_format]
+            except KeyError:
+                raise ConfigError(
+                    f"Unknown spelling_output_format {output_format!r}, "
+                    f"expected one of {['text', *report.FORMATS]}"
+                ) from None
+            self.report = report_class(self.outdir)
 
         self.env.settings["smart_quotes"] = False
         # Initialize the per-document filters
@@ -62,17 +113,45 @@ class SpellingBuilder(Builder):
             f.append(filters.AcronymFilter)
         if self.config.spelling_ignore_pypi_package_names:
             logger.info("Adding package names from PyPI to local dictionary…")
-            f.append(filters.PyPIFilterFactory())
+            names_filename = self.config.spelling_pypi_package_names_filename
+            if names_filename is not None:
+                names_filename = os.path.join(self.srcdir, names_filename)
+            with self._timer("init: PyPI package names"):
+                f.append(
+                    filters.PyPIFilterFactory(
+                        cache_filename=os.path.join(
+                            self.get_cache_dir(), "pypi-names.wordset"
+                        ),
+                        ttl=self.config.spelling_pypi_cache_ttl,
+                        names_filename=names_filename,
+                    )
+                )
         if self.config.spelling_ignore_python_builtins:
             logger.info("Ignoring Python builtins")
             f.append(filters.PythonBuiltinsFilter)
         if self.config.spelling_ignore_importable_modules:
             logger.info("Ignoring importable module names")
-            f.append(filters.ImportableModuleFilter)
+            with self._timer("init: importable module names"):
+                f.append(
+                    filters.ImportableModuleFilterFactory(
+                        cache_filename=os.path.join(
+                            self.get_cache_dir(), "modules.wordset"
+                        ),
+                    )
+                )
         if self.config.spelling_ignore_contributor_names:
             logger.info("Ignoring contributor names")
-            f.append(filters.ContributorFilter)
-        f.extend(self._load_filter_classes(self.config.spelling_filters))
+            with self._timer("init: contributor names"):
+                f.append(
+                    filters.ContributorFilterFactory(
+                        cache_filename=os.path.join(
+                            self.get_cache_dir(), "contributors.json"
+                        ),
+                    )
+                )
+        with self._timer("init: custom filters"):
+            f.extend(self._load_filter_classes(self.config.spelling_filters))
+        self.filter_factories = f
 
         if not os.path.isdir(self.outdir):
             os.mkdir(self.outdir)
@@ -80,14 +159,69 @@ class SpellingBuilder(Builder):
         word_list = self.get_wordlist_filename()
         logger.info("Looking for custom word list in %s", word_list)
 
-        self.checker = checker.SpellingChecker(
-            lang=self.config.spelling_lang,
-            tokenizer_lang=self.config.tokenizer_lang,
-            suggest=self.config.spelling_show_suggestions,
-            word_list_filename=word_list,
-            filters=f,
-            context_line=self.config.spelling_show_whole_line,
-        )
+        cache_filename = None
+        if self.config.spelling_verdict_cache:
+            cache_filename = os.path.join(self.get_cache_dir(), "verdicts.sqlite")
+            logger.info("Caching spelling verdicts in %s", cache_filename)
+
+        suggester = None
+        if self.config.spelling_show_suggestions:
+            engine = self.config.spelling_suggestion_engine
+            if engine == "symspell":
+                with self._timer("init: suggestion index"):
+                    suggester = self._get_suggestion_index(word_list)
+            elif engine != "backend":
+                raise ConfigError(
+                    f"Unknown spelling_suggestion_engine {engine!r}, "
+                    "expected one of ['backend', 'symspell']"
+                )
+
+        if self.config.spelling_backend not in checker.BACKENDS:
+            raise ConfigError(
+                f"Unknown spelling_backend {self.config.spelling_backend!r}, "
+                f"expected one of {list(checker.BACKENDS)}"
+            )
+
+        engine = self.config.spelling_tokenizer_engine
+        if engine not in ("enchant", "regex"):
+            raise ConfigError(
+                f"Unknown spelling_tokenizer_engine {engine!r}, "
+                "expected one of ['enchant', 'regex']"
+            )
+
+        with self._timer("init: checker"):
+            self.checker = checker.SpellingChecker(
+                lang=self.config.spelling_lang,
+                tokenizer_lang=self.config.tokenizer_lang,
+                # Suggestions are looked up when the build finishes,
+                # once for each distinct misspelled word.
+                suggest=False,
+                word_list_filename=word_list,
+                filters=f,
+                context_line=self.config.spelling_show_whole_line,
+                cache_filename=cache_filename,
+                memo_size=self.config.spelling_memo_size,
+                profile=self.profile,
+                backend=self.config.spelling_backend,
+                dictionary_filename=self.get_dictionary_filename(),
+                cache_dir=self.get_cache_dir(),
+                suggester=suggester,
+                tokenizer_engine=engine,
+            )
+
+        self.document_state = self._load_state()
+        self.excluded_docs = set()
+        # The misspellings found in each document, waiting for their
+        # suggestions before being written.
+        self.defer_suggestions = bool(self.config.spelling_show_suggestions)
+        self.pending = {}
+
+    def _timer(self, name):
+        # Record the time spent in the body of a with statement, if
+        # the build is being profiled.
+        if self.profile is None:
+            return contextlib.nullcontext()
+        return self.profile.timer(name)
 
     def _load_filter_classes(self, filters):
         # Filters may be expressed in the configuration file using
@@ -101,6 +235,37 @@ class SpellingBuilder(Builder):
             mod = importlib.import_module(module_name)
             yield getattr(mod, class_name)
 
+    def get_cache_dir(self):
+        "Returns the directory holding data saved between builds."
+        cache_dir = self.config.spelling_cache_dir
+        if cache_dir is None:
+            return os.path.join(self.outdir, ".spelling-cache")
+        return os.path.join(self.srcdir, cache_dir)
+
+    def _get_suggestion_index(self, word_list):
+        # The index covers the dictionary and the project word lists.
+        # Enchant cannot list the words in its dictionaries, so the
+        # Hunspell dictionary for the language is used instead unless
+        # one is configured.
+        dictionary_filename = self.get_dictionary_filename()
+        if dictionary_filename is None:
+            dictionary_filename = checker.MemoryBackend.find_dictionary(
+                self.config.spelling_lang
+            )
+        logger.info("Loading suggestion index for %s", dictionary_filename)
+        return symspell.SuggestionIndex.from_files(
+            [dictionary_filename, word_list],
+            cache_dir=self.get_cache_dir(),
+            limit=self.get_suggestion_limit(),
+        )
+
+    def get_dictionary_filename(self):
+        "Returns the filename of the dictionary for the memory backend."
+        filename = self.config.spelling_dictionary_filename
+        if filename is None:
+            return None
+        return os.path.join(self.srcdir, filename)
+
     def get_configured_wordlist_filenames(self):
         "Returns the configured wordlist filenames."
         word_list = self.config.spelling_word_list_filename
@@ -124,32 +289,140 @@ class SpellingBuilder(Builder):
         return self._build_combined_wordlist()
 
     def _build_combined_wordlist(self):
-        # If we have a list, the combined list is the first list plus all words
-        # from the other lists. Otherwise, word_list is assumed to just be a
-        # string.
-        temp_dir = tempfile.mkdtemp()
-        combined_word_list = os.path.join(temp_dir, "spelling_wordlist.txt")
-
-        with open(combined_word_list, "w", encoding="UTF-8") as outfile:
-            for word_file in self.get_configured_wordlist_filenames():
-                # Paths are relative
-                long_word_file = os.path.join(self.srcdir, word_file)
-                logger.info("Adding contents of %s to custom word list", long_word_file)
-                with open(long_word_file, encoding="UTF-8") as infile:
-                    infile_contents = infile.readlines()
-                outfile.writelines(infile_contents)
-
-                # Check for newline, and add one if not present
-                if infile_contents and not infile_contents[-1].endswith("\n"):
-                    outfile.write("\n")
-
+        # Combine the words from all of the lists into one list saved
+        # in the cache directory and named for a digest of the lists,
+        # so it is only written again when one of them changes.
+        filenames = self.get_configured_wordlist_filenames()
+        cache_dir = self.get_cache_dir()
+        digest = cache.file_digest(*filenames)[:16]
+        combined_word_list = os.path.join(cache_dir, f"wordlist-{digest}.txt")
+        if os.path.exists(combined_word_list):
+            logger.info("Using combined word list %s", combined_word_list)
+            return combined_word_list
+
+        words = set()
+        for word_file in filenames:
+            logger.info("Adding contents of %s to custom word list", word_file)
+            with open(word_file, encoding="UTF-8") as infile:
+                words.update(line.strip() for line in infile)
+        words.discard("")
+
+        ensuredir(cache_dir)
+        # Remove the lists combined from earlier versions of the files.
+        for name in os.listdir(cache_dir):
+            if name.startswith("wordlist-") and name.endswith(".txt"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(cache_dir, name))
+        with open(combined_word_list + ".tmp", "w", encoding="UTF-8") as outfile:
+            outfile.writelines(f"{word}\n" for word in sorted(words))
+        os.replace(combined_word_list + ".tmp", combined_word_list)
         return combined_word_list
 
+    def get_checker_signature(self):
+        """Returns a digest of the inputs that affect every document.
+
+        The signature covers the version of the extension, the spelling
+        related configuration settings (including the filters to use),
+        the contents of the word lists and of the dictionary file, and
+        the words ignored by filters with a digest() method, such as
+        the names of packages on PyPI and of contributors. When it
+        changes, the results recorded for earlier builds cannot be
+        reused.
+        """
+        h = hashlib.sha256()
+        h.update(importlib.metadata.version("sphinxcontrib-spelling").encode("utf-8"))
+        for item in sorted(self.config, key=lambda item: item.name):
+            if item.name in UNSIGNED_CONFIG:
+                continue
+            if item.name.startswith("spelling_") or item.name == "tokenizer_lang":
+                h.update(f"{item.name}={item.value!r}\n".encode())
+        dictionary_filename = self.get_dictionary_filename()
+        if dictionary_filename is not None:
+            h.update(
+                cache.file_digest(
+                    dictionary_filename,
+                    os.path.splitext(dictionary_filename)[0] + ".aff",
+                ).encode("utf-8")
+            )
+        for word_file in self.get_configured_wordlist_filenames():
+            try:
+                with open(word_file, "rb") as f:
+                    h.update(f.read())
+            except OSError:
+                # A missing word list is treated as empty by the
+                # checker, so only the name matters here.
+                h.update(word_file.encode("utf-8"))
+        for factory in self.filter_factories:
+            digest = getattr(factory, "digest", None)
+            if digest is not None:
+                h.update(digest().encode())
+        return h.hexdigest()
+
+    def get_state_filename(self):
+        "Returns the name of the file holding results of earlier builds."
+        return os.path.join(self.outdir, STATE_FILENAME)
+
+    def _load_state(self):
+        self.checker_signature = self.get_checker_signature()
+        try:
+            with open(self.get_state_filename(), encoding="UTF-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (
+            state.get("version") != STATE_VERSION
+            or state.get("signature") != self.checker_signature
+        ):
+            logger.info("Spelling configuration changed, checking all documents")
+            return {}
+        if self.report is not None and not os.path.exists(self.report.filename):
+            # The records of the documents that are not checked again
+            # come from the report, so without it every document has
+            # to be checked.
+            return {}
+        return state.get("documents", {})
+
+    def _save_state(self):
+        state = {
+            "version": STATE_VERSION,
+            "signature": self.checker_signature,
+            "documents": self.document_state,
+        }
+        state_filename = self.get_state_filename()
+        with open(state_filename + ".tmp", "w", encoding="UTF-8") as f:
+            json.dump(state, f)
+        os.replace(state_filename + ".tmp", state_filename)
+
+    def get_output_filename(self, docname):
+        "Returns the name of the file holding misspellings for a document."
+        return os.path.join(self.outdir, f"{docname}.spelling")
+
     def get_outdated_docs(self):
-        return "all documents"
+        # Documents that changed since the last time they were read
+        # are rebuilt by Sphinx anyway. Report the ones that have not
+        # been checked since they were last read, or that were checked
+        # with different settings.
+        for docname in self.env.found_docs:
+            if not self._is_current(docname):
+                yield docname
+
+    def _is_current(self, docname):
+        # The results recorded for a document are still valid if it
+        # has not been read again since it was checked.
+        record = self.document_state.get(docname)
+        return record is not None and record["read_time"] == self.env.all_docs.get(
+            docname
+        )
 
     def prepare_writing(self, docnames):
-        return
+        # Decide which documents are excluded once per build, instead
+        # of matching the patterns again for each document.
+        excluded = Matcher(self.config.spelling_exclude_patterns)
+        self.excluded_docs = {
+            docname
+            for docname in docnames
+            if excluded(str(self.env.doc2path(docname, None)))
+        }
 
     def get_target_uri(self, docname, typ=None):
         return ""
@@ -158,14 +431,18 @@ class SpellingBuilder(Builder):
         if not self.config.spelling_show_suggestions or not suggestions:
             return []
         to_show = suggestions
-        try:
-            n_to_show = int(self.config.spelling_suggestion_limit)
-        except ValueError:
-            n_to_show = 0
+        n_to_show = self.get_suggestion_limit()
         if n_to_show > 0:
             to_show = suggestions[:n_to_show]
         return to_show
 
+    def get_suggestion_limit(self):
+        "Returns the number of suggestions to show, or 0 for all of them."
+        try:
+            return int(self.config.spelling_suggestion_limit)
+        except ValueError:
+            return 0
+
     def format_suggestions(self, suggestions):
         to_show = self.get_suggestions_to_show(suggestions)
         if not to_show:
@@ -182,32 +459,330 @@ class SpellingBuilder(Builder):
         "title",
     }
 
+    def _get_app(self):
+        # Builder.app is deprecated in Sphinx 9.
+        return getattr(self, "_app", None) or self.app
+
+    def _get_doctree(self, docname):
+        if sphinx.version_info >= (9, 0):
+            return self.env.get_and_resolve_doctree(docname, self, tags=self.tags)
+        return self.env.get_and_resolve_doctree(docname, self)
+
+    def _select_docs(self, docnames):
+        """Returns the sorted names of the documents to check.
+
+        Sphinx also asks for documents whose results from an earlier
+        build are still valid, such as ones containing a toctree, or
+        all of them when run with -a. Those results are kept, and
+        excluded documents are recorded as having no misspellings,
+        so their doctrees never need to be loaded.
+        """
+        selected = []
+        for docname in docnames:
+            if docname in self.excluded_docs:
+                self._save_results(docname, 0, [] if self.report is not None else None)
+            elif not self._is_current(docname):
+                selected.append(docname)
+        skipped = len(docnames) - len(selected)
+        if skipped:
+            logger.debug("skipping %d excluded or unchanged documents", skipped)
+        return sorted(selected)
+
+    def _write_serial(self, docnames):
+        # Used by write() before Sphinx 8.1, and by write_documents()
+        # when not writing in parallel.
+        docnames = self._select_docs(docnames)
+        if len(docnames) > 1 and self.config.spelling_check_threads > 1:
+            self._write_concurrent(docnames)
+        elif docnames:
+            super()._write_serial(docnames)
+
+    def _write_concurrent(self, docnames):
+        """Check the documents using a pool of threads.
+
+        The doctrees are loaded, and the results written, in order by
+        the main thread, so only the checker is shared by the threads.
+        A few documents are checked ahead of the one being written, to
+        keep the threads busy without holding every doctree in memory.
+        As in a serial build, warnings are held until all of the
+        documents have been written.
+        """
+        nthreads = self.config.spelling_check_threads
+        app = self._get_app()
+        progress = status_iterator(
+            docnames,
+            "writing output... ",
+            "darkgreen",
+            len(docnames),
+            app.verbosity,
+        )
+
+        def check(docname, doctree):
+            start = time.perf_counter()
+            misspellings = list(self._find_misspellings(docname, doctree))
+            return misspellings, time.perf_counter() - start
+
+        def write_next():
+            docname, future = in_flight.popleft()
+            misspellings, elapsed = future.result()
+            self._write_results(docname, misspellings, elapsed)
+
+        in_flight = collections.deque()
+        with (
+            logging.pending_warnings(),
+            concurrent.futures.ThreadPoolExecutor(nthreads) as executor,
+        ):
+            for docname in progress:
+                self.phase = BuildPhase.RESOLVING
+                doctree = self._get_doctree(docname)
+                self.phase = BuildPhase.WRITING
+                self.write_doc_serialized(docname, doctree)
+                in_flight.append((docname, executor.submit(check, docname, doctree)))
+                if len(in_flight) >= 2 * nthreads:
+                    write_next()
+            while in_flight:
+                write_next()
+
+    def write_documents(self, docnames):
+        docnames = self._select_docs(docnames)
+        if not docnames:
+            return
+
+        if not self.parallel_ok:
+            super().write_documents(docnames)
+            return
+
+        # The checker and filters are created once by init() in the
+        # main process and inherited by the worker processes when they
+        # are forked. The workers load the doctrees themselves and
+        # send back the results for their documents, so they can be
+        # combined here.
+        app = self._get_app()
+        chunks = make_chunks(sorted(docnames), app.parallel)
+        progress = status_iterator(
+            chunks,
+            "writing output... ",
+            "darkgreen",
+            len(chunks),
+            app.verbosity,
+        )
+
+        def write_process(chunk):
+            self.phase = BuildPhase.WRITING
+            if self.profile is not None:
+                # Only send back what was recorded by this worker.
+                self.profile.reset()
+            for docname in chunk:
+                self.write_doc(docname, self._get_doctree(docname))
+            self.checker.flush()
+            return {
+                "documents": {
+                    docname: self.document_state[docname] for docname in chunk
+                },
+                "records": {
+                    docname: self.report_records[docname]
+                    for docname in chunk
+                    if docname in self.report_records
+                },
+                "pending": {
+                    docname: self.pending[docname]
+                    for docname in chunk
+                    if docname in self.pending
+                },
+                "profile": None if self.profile is None else self.profile.as_dict(),
+            }
+
+        def merge(chunk, results):
+            if results["profile"] is not None:
+                self.profile.merge(results["profile"])
+            self.document_state.update(results["documents"])
+            self.report_records.update(results["records"])
+            self.pending.update(results["pending"])
+            self.misspelling_count += sum(
+                record["misspellings"] for record in results["documents"].values()
+            )
+            next(progress)
+
+        tasks = ParallelTasks(app.parallel)
+        for chunk in chunks:
+            tasks.add_task(write_process, chunk, merge)
+        tasks.join()
+        logger.info("")
+
     def write_doc(self, docname, doctree):
         """write the document"""
-        lines = list(self._find_misspellings(docname, doctree))
-        self.misspelling_count += len(lines)
-        if lines:
-            output_filename = os.path.join(self.outdir, f"{docname}.spelling")
-            logger.info("Writing %s", output_filename)
-            ensuredir(os.path.dirname(output_filename))
-            with open(output_filename, "w", encoding="UTF-8") as output:
-                output.writelines(lines)
+        self._write_results(docname, self._find_misspellings(docname, doctree))
+
+    def _write_results(self, docname, misspellings, elapsed=0.0):
+        # Write the misspellings found in a document, or keep them
+        # until their suggestions are known. The elapsed time is the
+        # time already spent finding misspellings that were collected
+        # before being passed in.
+        start = time.perf_counter()
+        if self.defer_suggestions:
+            # Keep the misspellings until the build finishes and the
+            # suggestions for all of the distinct words are known.
+            pending = [
+                (source, lineno, word, context_line)
+                for source, lineno, word, _, context_line in misspellings
+            ]
+            if pending:
+                self.pending[docname] = pending
+            count = len(pending)
+            records = [] if self.report is not None else None
+        else:
+            count, records = self._write_misspellings(docname, misspellings)
+        if self.profile is not None:
+            elapsed += time.perf_counter() - start
+            self.profile.add_time("check documents", elapsed)
+            self.profile.documents[docname] = elapsed
+        self._save_results(docname, count, records)
+
+    def _write_misspellings(self, docname, misspellings):
+        # Log the misspellings of a document and write them to its
+        # output file, or collect them as records for a consolidated
+        # report. Returns the number of misspellings and the records.
+        output_filename = self.get_output_filename(docname)
+        records = [] if self.report is not None else None
+        count = 0
+        with contextlib.ExitStack() as stack:
+            # Only create the output file once there is something to
+            # write to it, and write each misspelling as it is found.
+            output = None
+            for source, lineno, word, suggestions, context_line in misspellings:
+                count += 1
+                formatted_suggestions = self.format_suggestions(suggestions)
+                self._log_misspelling(
+                    source, lineno, word, formatted_suggestions, context_line
+                )
+                if records is not None:
+                    records.append(
+                        {
+                            "document": docname,
+                            "source": source,
+                            "line": lineno,
+                            "word": word,
+                            "suggestions": suggestions,
+                            "context": context_line,
+                        }
+                    )
+                    continue
+                if output is None:
+                    logger.info("Writing %s", output_filename)
+                    ensuredir(os.path.dirname(output_filename))
+                    output = stack.enter_context(
+                        open(output_filename, "w", encoding="UTF-8")
+                    )
+                output.write(
+                    "%s:%s: (%s) %s %s\n"
+                    % (source, lineno, word, formatted_suggestions, context_line)
+                )
+        return count, records
+
+    def _write_pending(self):
+        # Look up the suggestions for each distinct misspelled word
+        # found during the build once, and then write the results of
+        # the documents that were checked.
+        words = sorted(
+            {word for pending in self.pending.values() for _, _, word, _ in pending}
+        )
+        logger.info("Finding suggestions for %d misspelled words", len(words))
+        with self._timer("finish: suggestions"):
+            suggestions = self._suggest_words(words)
+        for docname, pending in sorted(self.pending.items()):
+            misspellings = (
+                (
+                    source,
+                    lineno,
+                    word,
+                    self.get_suggestions_to_show(suggestions[word]),
+                    context_line,
+                )
+                for source, lineno, word, context_line in pending
+            )
+            _, records = self._write_misspellings(docname, misspellings)
+            if records is not None:
+                self.report_records[docname] = records
+        self.pending = {}
+
+    def _suggest_words(self, words):
+        # Returns a dictionary mapping each word to its suggestions,
+        # splitting the words between worker processes when the build
+        # runs in parallel, or between threads when
+        # spelling_check_threads is set.
+        app = self._get_app()
+        if len(words) < 2:
+            return self.checker.suggest_many(words)
+        if not self.parallel_ok:
+            nthreads = self.config.spelling_check_threads
+            if nthreads <= 1:
+                return self.checker.suggest_many(words)
+            suggestions = {}
+            with concurrent.futures.ThreadPoolExecutor(nthreads) as executor:
+                for result in executor.map(
+                    self.checker.suggest_many, make_chunks(words, nthreads)
+                ):
+                    suggestions.update(result)
+            return suggestions
+
+        suggestions = {}
+
+        def suggest_process(chunk):
+            result = self.checker.suggest_many(chunk)
+            self.checker.flush()
+            return result
+
+        def merge(chunk, result):
+            suggestions.update(result)
+
+        tasks = ParallelTasks(app.parallel)
+        for chunk in make_chunks(words, app.parallel):
+            tasks.add_task(suggest_process, chunk, merge)
+        tasks.join()
+        return suggestions
+
+    def _save_results(self, docname, count, records):
+        # Remember the results of checking a document. The records
+        # are only collected for consolidated reports.
+        if records is not None:
+            self.report_records[docname] = records
+        self.misspelling_count += count
+        self.document_state[docname] = {
+            "read_time": self.env.all_docs.get(docname),
+            "misspellings": count,
+        }
+        if not count and records is None:
+            # Remove the results of an earlier build that are no
+            # longer valid.
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.get_output_filename(docname))
+
+    def _log_misspelling(self, source, lineno, word, suggestions, context_line):
+        if not (self.config.spelling_warning or self.config.spelling_verbose):
+            return
+        msg_parts = [
+            f"{source}:{lineno}: ",
+            "Spell check",
+            red(word),
+        ]
+        if suggestions != "":
+            msg_parts.append(suggestions)
+        msg_parts.append(context_line)
+        msg = ": ".join(msg_parts) + "."
+        if self.config.spelling_warning:
+            logger.warning(msg)
+        else:
+            logger.info(msg)
 
     def _find_misspellings(self, docname, doctree):
-        excluded = Matcher(self.config.spelling_exclude_patterns)
-        if excluded(self.env.doc2path(docname, None)):
+        if docname in self.excluded_docs:
             return
-        # Build the document-specific word filter based on any good
-        # words listed in spelling directives. If we have no such
-        # words, we want to push an empty list of filters so that we
-        # can always safely pop the filter stack when we are done with
-        # this document.
-        doc_filters = []
+        # Ignore the good words listed in spelling directives and
+        # roles in the document. The collector turns them into a set
+        # when the document is read.
         good_words = self.env.spelling_document_words.get(docname)
         if good_words:
             logger.debug("Extending local dictionary for %s", docname)
-            doc_filters.append(filters.IgnoreWordsFilterFactory(good_words))
-        self.checker.push_filters(doc_filters)
 
         # Set up a filter for the types of nodes to ignore during
         # traversal.
@@ -221,48 +796,93 @@ class SpellingBuilder(Builder):
                 return False
             return True
 
-        for node in doctree.findall(filter):
-            # Get the location of the text being checked so we can
-            # report it in the output file. Nodes from text that
-            # comes in via an 'include' directive does not include
-            # the full path, so convert all to relative path
-            # for consistency.
-            source, node_lineno = docutils.utils.get_source_line(node)
-            source = osutil.relpath(source)
-
-            # Check the text of the node.
-            misspellings = self.checker.check(node.astext())
-            for word, suggestions, context_line, line_offset in misspellings:
-                # Avoid TypeError on nodes lacking a line number
-                # This happens for some node originating from docstrings
-                lineno = node_lineno
-                if lineno is not None:
-                    lineno += line_offset
-
-                msg_parts = [
-                    f"{source}:{lineno}: ",
-                    "Spell check",
-                    red(word),
-                ]
-                if self.format_suggestions(suggestions) != "":
-                    msg_parts.append(self.format_suggestions(suggestions))
-                msg_parts.append(context_line)
-                msg = ": ".join(msg_parts) + "."
-                if self.config.spelling_warning:
-                    logger.warning(msg)
-                elif self.config.spelling_verbose:
-                    logger.info(msg)
-                yield "%s:%s: (%s) %s %s\n" % (
-                    source,
-                    lineno,
-                    word,
-                    self.format_suggestions(suggestions),
-                    context_line,
-                )
-
-        self.checker.pop_filters()
-        return
+        # Check the text of all of the nodes together, so each
+        # distinct word is only looked up once per document.
+        nodes = list(doctree.findall(filter))
+        misspellings = self.checker.check_many(
+            ((i, node.astext()) for i, node in enumerate(nodes)),
+            ignore=good_words,
+        )
+        locations = {}
+        for i, word, suggestions, context_line, line_offset in misspellings:
+            try:
+                source, node_lineno = locations[i]
+            except KeyError:
+                # Get the location of the text being checked so we can
+                # report it in the output file. Nodes from text that
+                # comes in via an 'include' directive does not include
+                # the full path, so convert all to relative path
+                # for consistency.
+                source, node_lineno = docutils.utils.get_source_line(nodes[i])
+                source = osutil.relpath(source)
+                locations[i] = (source, node_lineno)
+
+            # Avoid TypeError on nodes lacking a line number
+            # This happens for some node originating from docstrings
+            lineno = node_lineno
+            if lineno is not None:
+                lineno += line_offset
+
+            yield (
+                source,
+                lineno,
+                word,
+                self.get_suggestions_to_show(suggestions),
+                context_line,
+            )
 
     def finish(self):
-        if self.misspelling_count:
-            logger.warning("Found %d misspelled words", self.misspelling_count)
+        if self.pending:
+            self._write_pending()
+        self.checker.flush()
+        for name, info in self.checker.memo_info().items():
+            logger.debug("%s memo: %d hits, %d misses", name, info.hits, info.misses)
+        if self.profile is not None:
+            self._report_profile()
+
+        # Forget about documents that have been removed from the
+        # project since the last build.
+        for docname in set(self.document_state) - set(self.env.found_docs):
+            del self.document_state[docname]
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.get_output_filename(docname))
+        if self.report is not None:
+            self._save_report()
+        self._save_state()
+
+        # Documents that were not checked during this build still
+        # count, using the results recorded for them earlier.
+        total = sum(record["misspellings"] for record in self.document_state.values())
+        if total:
+            logger.warning("Found %d misspelled words", total)
+
+    def _save_report(self):
+        # Keep the records of documents that were not checked during
+        # this build, and replace the others with the new results.
+        records = [
+            record
+            for record in self.report.load()
+            if record["document"] in self.env.found_docs
+            and record["document"] not in self.report_records
+        ]
+        for doc_records in self.report_records.values():
+            records.extend(doc_records)
+        records.sort(key=lambda record: record["document"])
+        logger.info("Writing %s", self.report.filename)
+        self.report.save(records)
+
+    def _report_profile(self):
+        # The memo statistics come from the checker in the main
+        # process, and do not include the workers of a parallel build.
+        for name, info in self.checker.memo_info().items():
+            self.profile.counters[f"{name} memo hits"] = info.hits
+            self.profile.counters[f"{name} memo misses"] = info.misses
+        logger.info("Spelling profile:")
+        for line in self.profile.format_table():
+            logger.info("  %s", line)
+        filename = self.config.spelling_profile_filename
+        if filename:
+            filename = os.path.join(self.outdir, filename)
+            logger.info("Writing spelling profile to %s", filename)
+            with open(filename, "w", encoding="UTF-8") as f:
+                json.dump(self.profile.as_dict(), f, indent=2)
@@ -0,0 +1,140 @@
+"""Persistent caches shared between builds."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(*filenames):
+    """Returns a digest of the contents of the named files.
+
+    Missing files are treated as empty, so that they can be created
+    later without leaving stale values in the cache.
+    """
+    h = hashlib.sha256()
+    for filename in filenames:
+        h.update(b"\0")
+        if filename is None:
+            continue
+        try:
+            with open(filename, "rb") as f:
+                h.update(f.read())
+        except FileNotFoundError:
+            pass
+    return h.hexdigest()
+
+
+class VerdictCache:
+    """Remember what the dictionary said about words between builds.
+
+    The verdicts are stored in an SQLite database, keyed by the
+    language of the dictionary and a digest of the contents of the
+    personal word list. Changing either one invalidates the earlier
+    verdicts automatically. All of the verdicts are loaded into memory
+    when the cache is opened, and new ones are written back in batches.
+    The cache can be used by several threads at once.
+    """
+
+    # Number of new verdicts to collect before writing them to disk.
+    flush_threshold = 1000
+
+    def __init__(self, filename, lang, word_list_filename=None):
+        self.filename = filename
+        self.namespace = f"{lang}:{file_digest(word_list_filename)}"
+        self._connection = None
+        self._pid = None
+        self._pending = {}
+        self._verdicts = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _connect(self):
+        # SQLite connections cannot be shared with child processes,
+        # so open a new one after forking for a parallel build.
+        if self._connection is None or self._pid != os.getpid():
+            dirname = os.path.dirname(self.filename)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            # The connection is only used while holding the lock, so
+            # it can be shared by the threads.
+            self._connection = sqlite3.connect(
+                self.filename, timeout=60, check_same_thread=False
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                " namespace TEXT NOT NULL,"
+                " word TEXT NOT NULL,"
+                " correct INTEGER NOT NULL,"
+                " suggestions TEXT,"
+                " PRIMARY KEY (namespace, word))"
+            )
+            self._pid = os.getpid()
+        return self._connection
+
+    def _load(self):
+        connection = self._connect()
+        with connection:
+            # Drop the verdicts made with a different dictionary or
+            # word list, since they can never be used again.
+            connection.execute(
+                "DELETE FROM verdicts WHERE namespace != ?", (self.namespace,)
+            )
+        rows = connection.execute(
+            "SELECT word, correct, suggestions FROM verdicts WHERE namespace = ?",
+            (self.namespace,),
+        )
+        for word, correct, suggestions in rows:
+            if suggestions is not None:
+                suggestions = json.loads(suggestions)
+            self._verdicts[word] = (bool(correct), suggestions)
+        logger.debug(
+            "loaded %d cached spelling verdicts from %s",
+            len(self._verdicts),
+            self.filename,
+        )
+
+    def get(self, word):
+        """Returns a tuple with the verdict and suggestions for the word.
+
+        The suggestions are None if they have not been computed. If
+        nothing is known about the word, returns None.
+        """
+        return self._verdicts.get(word)
+
+    def set(self, word, correct, suggestions=None):
+        "Record the verdict and, optionally, suggestions for the word."
+        with self._lock:
+            self._verdicts[word] = (correct, suggestions)
+            self._pending[word] = (correct, suggestions)
+            if len(self._pending) >= self.flush_threshold:
+                self._flush()
+
+    def flush(self):
+        "Write new verdicts to the database."
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        self.namespace,
+                        word,
+                        int(correct),
+                        None if suggestions is None else json.dumps(suggestions),
+                    )
+                    for word, (correct, suggestions) in self._pending.items()
+                ),
+            )
+        self._pending = {}
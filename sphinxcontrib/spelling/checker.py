@@ -3,20 +3,201 @@
 #
 """Spelling checker extension for Sphinx."""
 
+import bisect
+import functools
+import os
+import re
+import string
+import threading
+
 try:
     import enchant
     from enchant.tokenize import get_tokenizer
+
+    from .filters import FilterChain
+    from .tokenizer import RegexTokenizer
 except ImportError as imp_exc:
     enchant_import_error = imp_exc
 else:
     enchant_import_error = None
 
+from . import cache, hunspell, wordset
+
+
+class EnchantBackend:
+    """Looks words up in a dictionary provided by PyEnchant."""
+
+    name = "enchant"
+
+    # Every answer comes from a call into the C library, so checking
+    # words one at a time through the memo is as fast as it gets.
+    in_memory = False
+
+    def __init__(
+        self, lang, word_list_filename, dictionary_filename=None, cache_dir=None
+    ):
+        self.lang = lang
+        self.word_list_filename = word_list_filename
+        # Enchant dictionaries cannot be used by several threads at
+        # once, so each thread opens its own. The one for this thread
+        # is opened now, so a missing dictionary is reported right
+        # away.
+        self._local = threading.local()
+        self._local.dictionary = enchant.DictWithPWL(lang, word_list_filename)
+        # Used to keep the verdicts of different dictionaries apart.
+        self.cache_key = lang
+
+    @property
+    def dictionary(self):
+        "The dictionary used by the current thread."
+        try:
+            return self._local.dictionary
+        except AttributeError:
+            dictionary = enchant.DictWithPWL(self.lang, self.word_list_filename)
+            self._local.dictionary = dictionary
+            return dictionary
+
+    def check(self, word):
+        "Returns True if the word is spelled correctly."
+        return self.dictionary.check(word)
+
+    def check_many(self, words):
+        "Returns a list with the result of check() for each word."
+        return [self.dictionary.check(word) for word in words]
+
+    def suggest(self, word):
+        "Returns a list of suggested alternate spellings for the word."
+        return self.dictionary.suggest(word)
+
+
+class MemoryBackend:
+    """Looks words up in a WordSet held in memory.
+
+    The words are read from a Hunspell dictionary, expanding its
+    affixes, or from a plain word list with one word on each line. If
+    no dictionary is given, the Hunspell dictionary for the language
+    is looked for in the usual places. When a cache directory is
+    given, the expanded words are saved there and mapped into memory
+    by later builds and the worker processes of parallel builds.
+
+    Like Hunspell, a word in lower case also matches its capitalized
+    and upper case forms, and a capitalized word matches its upper
+    case form.
+    """
+
+    name = "memory"
+
+    # Looking words up costs no more than consulting the memo, so
+    # whole batches are checked at once.
+    in_memory = True
+
+    search_path = (
+        "/usr/share/hunspell",
+        "/usr/share/myspell",
+        "/usr/share/myspell/dicts",
+        "/usr/local/share/hunspell",
+        "/Library/Spelling",
+        os.path.expanduser("~/Library/Spelling"),
+    )
+
+    def __init__(
+        self, lang, word_list_filename, dictionary_filename=None, cache_dir=None
+    ):
+        if dictionary_filename is None:
+            dictionary_filename = self.find_dictionary(lang)
+        affix_filename = os.path.splitext(dictionary_filename)[0] + ".aff"
+        digest = cache.file_digest(dictionary_filename, affix_filename)
+        self.cache_key = f"{self.name}:{lang}:{digest}"
+        self.words = self._load_words(dictionary_filename, digest, cache_dir)
+        self.personal = set()
+        if word_list_filename is not None and os.path.exists(word_list_filename):
+            self.personal.update(hunspell.read_word_list(word_list_filename))
+
+    @classmethod
+    def find_dictionary(cls, lang):
+        "Returns the name of the Hunspell dictionary file for the language."
+        for dirname in cls.search_path:
+            filename = os.path.join(dirname, f"{lang}.dic")
+            if os.path.exists(filename):
+                return filename
+        raise RuntimeError(
+            f"Could not find a Hunspell dictionary for {lang!r} in "
+            f"{list(cls.search_path)}, set spelling_dictionary_filename"
+        )
+
+    @staticmethod
+    def _load_words(dictionary_filename, digest, cache_dir):
+        cache_filename = None
+        if cache_dir is not None:
+            cache_filename = os.path.join(
+                cache_dir, f"dictionary-{digest[:16]}.wordset"
+            )
+            try:
+                return wordset.WordSet.load(cache_filename)
+            except (OSError, ValueError):
+                pass
+        words = wordset.WordSet.from_words(hunspell.read_words(dictionary_filename))
+        if cache_filename is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            words.save(cache_filename + ".tmp")
+            os.replace(cache_filename + ".tmp", cache_filename)
+        return words
+
+    def _known(self, word):
+        return word in self.words or word in self.personal
+
+    def check(self, word):
+        "Returns True if the word is spelled correctly."
+        if self._known(word):
+            return True
+        if word.isupper():
+            return self._known(word.lower()) or self._known(word.capitalize())
+        if word[:1].isupper() and word[1:].islower():
+            return self._known(word.lower())
+        return False
+
+    def check_many(self, words):
+        "Returns a list with the result of check() for each word."
+        words = list(words)
+        results = self.words.contains_many(words)
+        for i, found in enumerate(results):
+            if not found:
+                results[i] = self.check(words[i])
+        return results
+
+    def suggest(self, word):
+        """Returns a list of suggested alternate spellings for the word.
+
+        The suggestions are the known words one edit away, made by
+        deleting, swapping, replacing, or inserting a letter.
+        """
+        letters = sorted(set(string.ascii_lowercase) | set(word.lower()))
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        candidates = [a + b[1:] for a, b in splits if b]
+        candidates.extend(a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1)
+        candidates.extend(a + c + b[1:] for a, b in splits if b for c in letters)
+        candidates.extend(a + c + b for a, b in splits for c in letters)
+        suggestions = []
+        seen = {word}
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                if self.check(candidate):
+                    suggestions.append(candidate)
+        return suggestions
+
+
+# The backends that can be selected with the spelling_backend option.
+BACKENDS = {cls.name: cls for cls in (EnchantBackend, MemoryBackend)}
+
 
 class SpellingChecker:
     """Checks the spelling of blocks of text.
 
     Uses options defined in the sphinx configuration file to control
-    the checking and filtering behavior.
+    the checking and filtering behavior. check() and check_many() may
+    be called by several threads at once, as long as the filters are
+    not being changed with push_filters() or pop_filters().
     """
 
     def __init__(
@@ -27,6 +208,14 @@ class SpellingChecker:
         tokenizer_lang="en_US",
         filters=None,
         context_line=False,
+        cache_filename=None,
+        memo_size=10000,
+        profile=None,
+        backend="enchant",
+        dictionary_filename=None,
+        cache_dir=None,
+        suggester=None,
+        tokenizer_engine="enchant",
     ):
         if enchant_import_error is not None:
             raise RuntimeError(
@@ -34,14 +223,94 @@ class SpellingChecker:
             ) from enchant_import_error
         if filters is None:
             filters = []
-        self.dictionary = enchant.DictWithPWL(lang, word_list_filename)
-        self.tokenizer = get_tokenizer(tokenizer_lang, filters=filters)
+        self.profile = profile
+        try:
+            backend_class = BACKENDS[backend]
+        except KeyError:
+            raise ValueError(
+                f"Unknown spelling backend {backend!r}, "
+                f"expected one of {list(BACKENDS)}"
+            ) from None
+        self.backend = backend_class(
+            lang,
+            word_list_filename,
+            dictionary_filename=dictionary_filename,
+            cache_dir=cache_dir,
+        )
+        self._check_word = self.backend.check
+        self._check_words = self.backend.check_many
+        # Suggestions come from the backend unless another engine,
+        # with a suggest() method, is given.
+        self.suggester = suggester if suggester is not None else self.backend
+        self._suggest_words = self.suggester.suggest
+        if profile is not None:
+            self._check_word = profile.timed("dictionary check", self._check_word)
+            self._check_words = profile.timed(
+                "dictionary check_many", self._check_words
+            )
+            self._suggest_words = profile.timed(
+                "dictionary suggest", self._suggest_words
+            )
+            filters = [profile.wrap_filter(f) for f in filters]
+        self.verdicts = None
+        if cache_filename is not None:
+            cache_key = self.backend.cache_key
+            if suggester is not None:
+                cache_key += ":" + suggester.cache_key
+            self.verdicts = cache.VerdictCache(
+                cache_filename, cache_key, word_list_filename
+            )
+        # Remember the answers of the dictionary for the most recently
+        # used words. The answers do not depend on the filters, so the
+        # memo does not need to be cleared when filters are pushed or
+        # popped.
+        self._is_correct = functools.lru_cache(maxsize=memo_size)(self._is_correct)
+        self._get_suggestions = functools.lru_cache(maxsize=memo_size)(
+            self._get_suggestions
+        )
+        if tokenizer_engine == "regex":
+            language = RegexTokenizer(tokenizer_lang)
+        elif tokenizer_engine == "enchant":
+            language = None
+        else:
+            raise ValueError(
+                f"Unknown tokenizer engine {tokenizer_engine!r}, "
+                "expected one of ['enchant', 'regex']"
+            )
+        # Apply the built-in filters in a single pass when possible.
+        self.tokenizer = FilterChain.from_filters(tokenizer_lang, filters, language)
+        if self.tokenizer is None:
+            if language is None:
+                self.tokenizer = get_tokenizer(tokenizer_lang, filters=filters)
+            else:
+                self.tokenizer = language.wrap(filters)
         self.original_tokenizer = self.tokenizer
         self.suggest = suggest
         self.context_line = context_line
 
+    @property
+    def dictionary(self):
+        """The PyEnchant dictionary used by the enchant backend.
+
+        Kept for code written before the backends were added. The
+        other backends have no dictionary, so this raises
+        AttributeError when one of them is used.
+        """
+        return self.backend.dictionary
+
     def push_filters(self, new_filters):
-        """Add a filter to the tokenizer chain."""
+        """Add a filter to the tokenizer chain.
+
+        The filters apply to every thread using the checker. Pass the
+        words to skip in one block of text to check() instead.
+        """
+        if self.profile is not None:
+            new_filters = [self.profile.wrap_filter(f) for f in new_filters]
+        if isinstance(self.tokenizer, FilterChain):
+            chain = self.tokenizer.with_filters(new_filters)
+            if chain is not None:
+                self.tokenizer = chain
+                return
         t = self.tokenizer
         for f in new_filters:
             t = f(t)
@@ -51,18 +320,169 @@ class SpellingChecker:
         """Remove the filters pushed during the last call to push_filters()."""
         self.tokenizer = self.original_tokenizer
 
-    def check(self, text):
-        """Yields bad words and suggested alternate spellings."""
+    def memo_info(self):
+        """Returns the hit and miss counters of the in-memory memo.
+
+        The result is a dictionary mapping "check" and "suggest" to
+        the statistics for the respective dictionary calls.
+        """
+        return {
+            "check": self._is_correct.cache_info(),
+            "suggest": self._get_suggestions.cache_info(),
+        }
+
+    def flush(self):
+        """Save any new verdicts to the persistent cache."""
+        if self.verdicts is not None:
+            self.verdicts.flush()
+
+    def _is_correct(self, word):
+        if self.verdicts is None:
+            return self._check_word(word)
+        verdict = self.verdicts.get(word)
+        if verdict is not None:
+            return verdict[0]
+        correct = self._check_word(word)
+        self.verdicts.set(word, correct)
+        return correct
+
+    def _get_suggestions(self, word):
+        if self.verdicts is None:
+            return self._suggest_words(word)
+        verdict = self.verdicts.get(word)
+        if verdict is not None and verdict[1] is not None:
+            return verdict[1]
+        suggestions = self._suggest_words(word)
+        self.verdicts.set(word, False, suggestions)
+        return suggestions
+
+    def suggest_many(self, words):
+        """Returns suggested alternate spellings for several words.
+
+        The result maps each distinct word to its suggestions, so
+        callers that find the same bad word many times only pay for
+        looking it up once.
+        """
+        return {word: self._get_suggestions(word) for word in set(words)}
+
+    def check(self, text, ignore=None):
+        """Yields bad words and suggested alternate spellings.
+
+        The words in ignore, a set of words known to be spelled
+        correctly in the text, are skipped after the filters have been
+        applied, without changing the tokenizer.
+        """
+        ntokens = 0
+        nignored = 0
+        lines = None
         for word, pos in self.tokenizer(text):
-            correct = self.dictionary.check(word)
-            if correct:
+            if ignore and word in ignore:
+                nignored += 1
+                continue
+            ntokens += 1
+            if self._is_correct(word):
                 continue
 
-            suggestions = self.dictionary.suggest(word) if self.suggest else []
-            line = line_of_index(text, pos) if self.context_line else ""
-            line_offset = text.count("\n", 0, pos)
+            suggestions = self._get_suggestions(word) if self.suggest else []
+            if lines is None:
+                lines = LineIndex(text)
+            line_offset = lines.line_number(pos)
+            line = lines.line(line_offset) if self.context_line else ""
 
             yield word, suggestions, line, line_offset
+        if self.profile is not None:
+            self.profile.count("tokens checked", ntokens)
+            if ignore:
+                self.profile.count("skipped by document words", nignored)
+
+    def check_many(self, items, ignore=None):
+        """Yields bad words found in several blocks of text.
+
+        The items are pairs of a key identifying a block of text and
+        the text itself. The blocks are tokenized together, and every
+        distinct word is only checked once. For each bad word, yields
+        the key of the block, the word, suggested alternate spellings,
+        the line containing the word (if requested), and the line
+        number of that line within the block. The words in ignore are
+        skipped, as with check().
+        """
+        keys = []
+        texts = []
+        for key, text in items:
+            keys.append(key)
+            texts.append(text)
+        if not texts:
+            return
+
+        # Tokenize all of the blocks in a single pass, joined with
+        # newlines so no token spans two blocks, and find the block
+        # each word came from using its position.
+        starts = []
+        pos = 0
+        for text in texts:
+            starts.append(pos)
+            pos += len(text) + 1
+        joined = "\n".join(texts)
+        tokens = list(self.tokenizer(joined))
+        if ignore:
+            ntokens = len(tokens)
+            tokens = [token for token in tokens if token[0] not in ignore]
+            if self.profile is not None:
+                self.profile.count("skipped by document words", ntokens - len(tokens))
+        if self.profile is not None:
+            self.profile.count("tokens checked", len(tokens))
+
+        words = {word for word, pos in tokens}
+        if self.backend.in_memory:
+            # Ask the backend about all of the words at once.
+            words = list(words)
+            bad = [w for w, ok in zip(words, self._check_words(words)) if not ok]
+        else:
+            bad = [word for word in words if not self._is_correct(word)]
+        bad_words = {}
+        for word in bad:
+            bad_words[word] = self._get_suggestions(word) if self.suggest else []
+
+        # The blocks are separated by newlines, so the lines of the
+        # joined text are the lines of the blocks, and the line number
+        # within a block is found using the line its block starts on.
+        lines = None
+        for word, pos in tokens:
+            if word not in bad_words:
+                continue
+            if lines is None:
+                lines = LineIndex(joined)
+            i = bisect.bisect_right(starts, pos) - 1
+            line_number = lines.line_number(pos)
+            line = lines.line(line_number) if self.context_line else ""
+            line_offset = line_number - lines.line_number(starts[i])
+            yield keys[i], word, bad_words[word], line, line_offset
+
+
+class LineIndex:
+    """Finds the lines containing positions in a block of text.
+
+    The positions of the newlines are found once, so that looking up
+    a line takes time proportional to the log of the number of lines,
+    instead of scanning the text each time.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.newlines = [m.start() for m in re.finditer("\n", text)]
+
+    def line_number(self, index):
+        "Returns the number of the line containing index, counting from 0."
+        return bisect.bisect_left(self.newlines, index)
+
+    def line(self, line_number):
+        "Returns the text of the line, without the newline."
+        start = self.newlines[line_number - 1] + 1 if line_number else 0
+        if line_number < len(self.newlines):
+            end = self.newlines[line_number]
+        else:
+            end = len(self.text)
+        return self.text[start:end]
 
 
 def line_of_index(text, index):
@@ -6,14 +6,33 @@
 # TODO - Words with multiple uppercase letters treated as classes and ignored
 
 import builtins
+import hashlib
 import importlib
+import importlib.machinery
+import json
+import os
+import pkgutil
+import re
 import subprocess
 import sys
+import time
 
 import requests
-from enchant.tokenize import Filter, get_tokenizer, tokenize, unit_tokenize
+from enchant.tokenize import (
+    EmailFilter,
+    Filter,
+    URLFilter,
+    WikiWordFilter,
+    basic_tokenize,
+    get_tokenizer,
+    tokenize,
+)
+from enchant.tokenize import en as tokenize_en
 from sphinx.util import logging
 
+from . import wordset
+from .tokenizer import RegexTokenizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,13 +53,10 @@ class AcronymFilter(Filter):
 class list_tokenize(tokenize):
     def __init__(self, words):
         super().__init__("")
-        self._words = words
+        self._words = iter(words)
 
     def next(self):
-        if not self._words:
-            raise StopIteration()
-        word = self._words.pop(0)
-        return (word, 0)
+        return (next(self._words), 0)
 
 
 class ContractionFilter(Filter):
@@ -121,27 +137,35 @@ class ContractionFilter(Filter):
         "you've": ["you", "have"],
     }
 
-    def _split(self, word):
+    def _split_words(self, word):
+        "Returns the words to check in place of the word."
+        lower = word.lower()
+
         # Fixed responses
-        if word.lower() in self.splits:
-            return list_tokenize(self.splits[word.lower()])
+        if lower in self.splits:
+            return self.splits[lower]
 
         # Possessive
-        if word.lower().endswith("'s"):
-            return unit_tokenize(word[:-2])
+        if lower.endswith("'s"):
+            return [word[:-2]]
 
         # * not
-        if word.lower().endswith("n't"):
-            return unit_tokenize(word[:-3])
+        if lower.endswith("n't"):
+            return [word[:-3]]
+
+        return [word]
 
-        return unit_tokenize(word)
+    def _split(self, word):
+        return list_tokenize(self._split_words(word))
 
 
 class IgnoreWordsFilter(Filter):
     """Given a set of words, ignore them all."""
 
     def __init__(self, tokenizer, word_set):
-        self.word_set = set(word_set)
+        if not isinstance(word_set, wordset.WordSet):
+            word_set = set(word_set)
+        self.word_set = word_set
         super().__init__(tokenizer)
 
     def _skip(self, word):
@@ -149,27 +173,136 @@ class IgnoreWordsFilter(Filter):
 
 
 class IgnoreWordsFilterFactory:
-    def __init__(self, words):
+    """Build IgnoreWordsFilters for a list of words.
+
+    If compact is true, the words are stored in a WordSet once, and
+    every filter created by the factory shares it.
+    """
+
+    def __init__(self, words, compact=False):
+        if compact and not isinstance(words, wordset.WordSet):
+            words = wordset.WordSet.from_words(words)
         self.words = words
 
     def __call__(self, tokenizer):
         return IgnoreWordsFilter(tokenizer, self.words)
 
+    def digest(self):
+        "Returns a hex digest of the words, which changes when they do."
+        if isinstance(self.words, wordset.WordSet):
+            return self.words.digest()
+        return hashlib.sha256("\n".join(sorted(self.words)).encode()).hexdigest()
+
 
 class PyPIFilterFactory(IgnoreWordsFilterFactory):
-    """Build an IgnoreWordsFilter for all of the names of packages on PyPI."""
-
-    def __init__(self):
-        r = requests.get(
-            "https://pypi.org/simple/",
-            headers={
-                "user-agent": "sphinxcontrib.spelling",
-                "accept": "application/vnd.pypi.simple.v1+json",
-            },
-        )
-        names = [i["name"] for i in r.json()["projects"]]
-        logger.debug("retrieved %d project names from pypi.org", len(names))
-        super().__init__(names)
+    """Build an IgnoreWordsFilter for all of the names of packages on PyPI.
+
+    The names can be read from a file prepared ahead of time, with
+    one name per line, so that no network access is needed. Otherwise
+    they are downloaded from pypi.org. When a cache filename is given,
+    the downloaded names are saved there and reused until they are
+    older than ttl seconds. After that, the cached names are
+    revalidated with a conditional request, and used as they are if
+    the index cannot be reached.
+
+    The names are kept in a WordSet, and the cache file is mapped into
+    memory instead of being read, so it loads quickly and is shared by
+    the processes of a parallel build.
+    """
+
+    url = "https://pypi.org/simple/"
+
+    def __init__(self, cache_filename=None, ttl=86400, names_filename=None, timeout=30):
+        if names_filename is not None:
+            names = self._read_names(names_filename)
+            logger.debug("read %d project names from %s", len(names), names_filename)
+        else:
+            names = self._get_names(cache_filename, ttl, timeout)
+        super().__init__(names, compact=True)
+
+    @staticmethod
+    def _read_names(filename):
+        with open(filename, encoding="utf-8") as f:
+            return wordset.WordSet.from_words(f.read().split())
+
+    def _get_names(self, cache_filename, ttl, timeout):
+        names = None
+        metadata = {}
+        if cache_filename is not None:
+            try:
+                with open(cache_filename + ".json", encoding="utf-8") as f:
+                    metadata = json.load(f)
+                names = wordset.WordSet.load(cache_filename)
+            except (OSError, ValueError):
+                metadata = {}
+            else:
+                if time.time() - metadata.get("fetched", 0) < ttl:
+                    logger.debug(
+                        "using %d cached project names from %s",
+                        len(names),
+                        cache_filename,
+                    )
+                    return names
+
+        headers = {
+            "user-agent": "sphinxcontrib.spelling",
+            "accept": "application/vnd.pypi.simple.v1+json",
+        }
+        if names is not None:
+            if metadata.get("etag"):
+                headers["if-none-match"] = metadata["etag"]
+            if metadata.get("last_modified"):
+                headers["if-modified-since"] = metadata["last_modified"]
+        try:
+            r = requests.get(self.url, headers=headers, timeout=timeout)
+            r.raise_for_status()
+        except requests.RequestException as err:
+            if names is None:
+                logger.warning("Failed to retrieve project names from PyPI: %s", err)
+                return []
+            logger.warning(
+                "Failed to retrieve project names from PyPI, using cached list: %s",
+                err,
+            )
+            return names
+
+        changed = False
+        if r.status_code == 304:
+            logger.debug("cached project names from pypi.org are still current")
+        else:
+            new_names = wordset.WordSet.from_words(
+                i["name"] for i in r.json()["projects"]
+            )
+            logger.debug("retrieved %d project names from pypi.org", len(new_names))
+            if names is None or new_names.digest() != names.digest():
+                names = new_names
+                changed = True
+        if cache_filename is not None:
+            metadata = {
+                "fetched": time.time(),
+                "etag": r.headers.get("etag"),
+                "last_modified": r.headers.get("last-modified"),
+            }
+            # The cached names are mapped into memory, so only replace
+            # them when they have changed.
+            if changed:
+                self._save_names(cache_filename, names)
+            self._save_metadata(cache_filename, metadata)
+        return names
+
+    @staticmethod
+    def _save_names(cache_filename, names):
+        dirname = os.path.dirname(cache_filename)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        names.save(cache_filename + ".tmp")
+        os.replace(cache_filename + ".tmp", cache_filename)
+
+    @staticmethod
+    def _save_metadata(cache_filename, metadata):
+        with open(cache_filename + ".json.tmp", "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(cache_filename + ".json.tmp", cache_filename + ".json")
 
 
 class PythonBuiltinsFilter(Filter):
@@ -180,10 +313,16 @@ class PythonBuiltinsFilter(Filter):
 
 
 class ImportableModuleFilter(Filter):
-    """Ignore names of modules that we could import."""
+    """Ignore names of modules that we could import.
 
-    def __init__(self, tokenizer):
+    If a collection of module names is given, words are only looked up
+    in it. Otherwise, the import system is asked to find each new
+    name.
+    """
+
+    def __init__(self, tokenizer, module_names=None):
         super().__init__(tokenizer)
+        self.module_names = module_names
         self.found_modules = set(sys.builtin_module_names)
         self.sought_modules = self.found_modules.copy()
         # By adding __main__ to the list of sought modules but not
@@ -207,6 +346,9 @@ class ImportableModuleFilter(Filter):
             )
             word = word[:-3]
 
+        if self.module_names is not None:
+            return word in self.module_names
+
         valid_module_name = all(n.isidentifier() for n in word.split("."))
         if not valid_module_name:
             return False
@@ -228,6 +370,223 @@ class ImportableModuleFilter(Filter):
         return word in self.found_modules
 
 
+class ImportableModuleFilterFactory:
+    """Build ImportableModuleFilters sharing an index of module names.
+
+    The index is built by looking for modules and packages in the
+    directories on sys.path, and asking the path entry and meta path
+    finders that can list their modules, without importing anything.
+    Meta path finders that cannot list their modules, such as the ones
+    for editable installs, are asked about each word instead. When a
+    cache filename is given, the index is saved there and reused until
+    the contents of sys.path, or the modification times of its
+    directories, change.
+    """
+
+    def __init__(self, cache_filename=None):
+        self.module_names = self._get_module_names(cache_filename)
+
+    def __call__(self, tokenizer):
+        return ImportableModuleFilter(tokenizer, self.module_names)
+
+    def digest(self):
+        "Returns a hex digest of the index, which changes when it does."
+        # The modules imported by the time the index is loaded vary
+        # from one build to the next, so only the index is used.
+        index = self.module_names
+        if isinstance(index, _UnionSet):
+            index = index.collections[0]
+        return index.digest()
+
+    @staticmethod
+    def _get_index_key():
+        key = [sys.version]
+        for path in sys.path:
+            try:
+                key.append([path, os.stat(path or os.curdir).st_mtime])
+            except OSError:
+                key.append([path, None])
+        key.append([_finder_name(finder) for finder in sys.meta_path])
+        return key
+
+    def _get_module_names(self, cache_filename):
+        key = self._get_index_key()
+        index = None
+        if cache_filename is not None:
+            try:
+                with open(cache_filename + ".json", encoding="utf-8") as f:
+                    cached_key = json.load(f)
+                if cached_key == key:
+                    index = wordset.WordSet.load(cache_filename)
+                    logger.debug("using cached module index from %s", cache_filename)
+            except (OSError, ValueError):
+                pass
+
+        if index is None:
+            logger.info("Indexing importable modules")
+            names = self._scan_paths(sys.path)
+            names.update(self._scan_finders(sys.meta_path))
+            index = wordset.WordSet.from_words(names)
+            if cache_filename is not None:
+                dirname = os.path.dirname(cache_filename)
+                if dirname:
+                    os.makedirs(dirname, exist_ok=True)
+                index.save(cache_filename + ".tmp")
+                os.replace(cache_filename + ".tmp", cache_filename)
+                with open(cache_filename + ".json.tmp", "w", encoding="utf-8") as f:
+                    json.dump(key, f)
+                os.replace(cache_filename + ".json.tmp", cache_filename + ".json")
+
+        # Modules that are already imported, such as os.path, may not
+        # be found by looking at the files on sys.path.
+        loaded = {
+            name
+            for name in sys.modules
+            if isinstance(name, str) and name not in index and name != "__main__"
+        }
+        extras = []
+        if loaded:
+            extras.append(frozenset(loaded))
+        finders = [
+            finder
+            for finder in sys.meta_path
+            if finder not in _STANDARD_FINDERS and not hasattr(finder, "iter_modules")
+        ]
+        if finders:
+            extras.append(_FinderSet(finders))
+        if not extras:
+            return index
+        return _UnionSet(index, *extras)
+
+    @staticmethod
+    def _scan_paths(paths):
+        # Look at the longest suffixes first, so the extension module
+        # "name.cpython-312-x86_64-linux-gnu.so" is not taken for
+        # "name.cpython-312-x86_64-linux-gnu" with the suffix ".so".
+        suffixes = sorted(importlib.machinery.all_suffixes(), key=len, reverse=True)
+        names = set(sys.builtin_module_names)
+
+        def scan(dirname, prefix, namespace_ok):
+            try:
+                entries = list(os.scandir(dirname))
+            except OSError:
+                return
+            for entry in entries:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    if not name.isidentifier():
+                        continue
+                    is_package = any(
+                        os.path.isfile(os.path.join(entry.path, "__init__" + suffix))
+                        for suffix in suffixes
+                    )
+                    # Any directory can be imported as a namespace
+                    # package, but only look inside the ones at the
+                    # top level, to avoid walking trees of data files.
+                    if is_package or namespace_ok:
+                        names.add(prefix + name)
+                        scan(entry.path, prefix + name + ".", False)
+                    continue
+                for suffix in suffixes:
+                    if name.endswith(suffix):
+                        module = name[: -len(suffix)]
+                        if module.isidentifier() and module != "__init__":
+                            names.add(prefix + module)
+                        break
+
+        for path in paths:
+            scan(path or os.curdir, "", True)
+        # Entries that are not directories, such as zip files, and
+        # entries handled by hooks in sys.path_hooks are only listed
+        # by their importers.
+        names.update(info.name for info in pkgutil.iter_modules(paths))
+        names.discard("__main__")
+        return names
+
+    @classmethod
+    def _scan_finders(cls, finders):
+        names = set()
+        for finder in finders:
+            if finder in _STANDARD_FINDERS:
+                continue
+            try:
+                names.update(name for name, _ in pkgutil.iter_importer_modules(finder))
+            except Exception as err:
+                logger.debug("could not list modules of %r: %s", finder, err)
+            # The finders setuptools installs for editable installs
+            # cannot list their modules, but keep a mapping of the
+            # top level names to their directories.
+            mapping = getattr(sys.modules.get(finder.__module__), "MAPPING", None)
+            if not isinstance(mapping, dict):
+                continue
+            for name, path in mapping.items():
+                if not (isinstance(name, str) and name.isidentifier()):
+                    continue
+                names.add(name)
+                names.update(
+                    name + "." + child
+                    for child in cls._scan_paths([path])
+                    if child not in sys.builtin_module_names
+                )
+        return names
+
+
+_STANDARD_FINDERS = (
+    importlib.machinery.BuiltinImporter,
+    importlib.machinery.FrozenImporter,
+    importlib.machinery.PathFinder,
+)
+
+
+def _finder_name(finder):
+    if not isinstance(finder, type):
+        finder = type(finder)
+    return f"{finder.__module__}.{finder.__qualname__}"
+
+
+class _FinderSet:
+    """Membership test asking meta path finders whether they find a module.
+
+    The finders are asked directly, so the parent packages of a name
+    are not imported.
+    """
+
+    def __init__(self, finders):
+        self.finders = finders
+        self.found = {}
+
+    def __contains__(self, word):
+        try:
+            return self.found[word]
+        except KeyError:
+            pass
+        found = False
+        if all(n.isidentifier() for n in word.split(".")):
+            for finder in self.finders:
+                try:
+                    found = finder.find_spec(word, None) is not None
+                except Exception:
+                    continue
+                if found:
+                    break
+        self.found[word] = found
+        return found
+
+
+class _UnionSet:
+    "Membership test against several collections of words."
+
+    def __init__(self, *collections):
+        self.collections = collections
+
+    def __contains__(self, word):
+        return any(word in c for c in self.collections)
+
+
 class ContributorFilter(IgnoreWordsFilter):
     """Accept information about contributors as spelled correctly.
 
@@ -241,15 +600,18 @@ class ContributorFilter(IgnoreWordsFilter):
         contributors = self._get_contributors()
         super().__init__(tokenizer, contributors)
 
-    def _get_contributors(self):
+    @classmethod
+    def _get_contributors(cls, revisions=None):
         logger.info("Scanning contributors")
         cmd = [
             "git",
             "log",
             "--quiet",
             "--no-color",
-            f"--pretty=format:{self._pretty_format}",
+            f"--pretty=format:{cls._pretty_format}",
         ]
+        if revisions is not None:
+            cmd.append(revisions)
 
         try:
             p = subprocess.run(cmd, check=True, stdout=subprocess.PIPE)
@@ -260,3 +622,244 @@ class ContributorFilter(IgnoreWordsFilter):
         output = p.stdout.decode("utf-8")
         tokenizer = get_tokenizer("en_US", filters=[])
         return {word for word, pos in tokenizer(output)}
+
+
+class ContributorFilterFactory(IgnoreWordsFilterFactory):
+    """Build an IgnoreWordsFilter for the names of contributors.
+
+    The names found in the git history are saved in the cache file,
+    along with the repository and the commit that was scanned. When
+    the HEAD of the same repository has moved forward, only the new
+    commits are scanned. Otherwise the whole history is scanned
+    again.
+    """
+
+    def __init__(self, cache_filename=None):
+        super().__init__(self._get_contributors(cache_filename))
+
+    @staticmethod
+    def _git(*args):
+        try:
+            p = subprocess.run(
+                ("git",) + args,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            return None
+        return p.stdout.decode("utf-8").strip()
+
+    def _get_contributors(self, cache_filename):
+        head = self._git("rev-parse", "HEAD")
+        repository = self._git("rev-parse", "--show-toplevel")
+        if cache_filename is None or head is None:
+            return ContributorFilter._get_contributors()
+
+        try:
+            with open(cache_filename, encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+
+        if cached.get("repository") != repository or not cached.get("head"):
+            names = ContributorFilter._get_contributors()
+        elif cached["head"] == head:
+            logger.debug("using cached contributors for %s", head)
+            return set(cached["names"])
+        elif self._git("merge-base", "--is-ancestor", cached["head"], head) is not None:
+            logger.debug("scanning contributors since %s", cached["head"])
+            names = set(cached["names"])
+            names.update(
+                ContributorFilter._get_contributors(f"{cached['head']}..{head}")
+            )
+        else:
+            names = ContributorFilter._get_contributors()
+
+        dirname = os.path.dirname(cache_filename)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(cache_filename + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {"repository": repository, "head": head, "names": sorted(names)},
+                f,
+            )
+        os.replace(cache_filename + ".tmp", cache_filename)
+        return names
+
+
+# The filters that FilterChain can apply itself. Apart from
+# ContractionFilter, they only skip words.
+_CHAIN_FILTERS = {
+    AcronymFilter,
+    ContractionFilter,
+    ContributorFilter,
+    EmailFilter,
+    IgnoreWordsFilter,
+    ImportableModuleFilter,
+    PythonBuiltinsFilter,
+    URLFilter,
+    WikiWordFilter,
+}
+
+# The factories whose filters are all in _CHAIN_FILTERS.
+_CHAIN_FACTORIES = (IgnoreWordsFilterFactory, ImportableModuleFilterFactory)
+
+_NON_SPACE = re.compile(r"\S+")
+
+
+class FilterChain:
+    """Tokenize text and apply the built-in filters in a single pass.
+
+    Each filter wrapped around a PyEnchant tokenizer creates new
+    tokenizer objects for every word it passes on, which adds up to a
+    large share of the time spent checking text. A FilterChain finds
+    the same words, at the same positions, by calling the methods of
+    the filters directly. It only works with the filters defined here
+    and in PyEnchant, so use from_filters() to decide whether it can
+    be used at all.
+
+    The filters are applied in order to the words found by splitting
+    the text on whitespace, before the words are split again by the
+    tokenizer for the language. The filters added with with_filters()
+    are applied to the words that come out of the chain, like filters
+    wrapped around a complete tokenizer.
+    """
+
+    def __init__(self, language, stages, after=()):
+        self._language = language
+        # Any word made only of letters is returned unchanged by the
+        # tokenizers based on the English one.
+        self._letters_unchanged = isinstance(language, RegexTokenizer) or (
+            isinstance(language, type) and issubclass(language, tokenize_en.tokenize)
+        )
+        self._stages = stages
+        self._after = tuple(after)
+
+    @staticmethod
+    def _get_instances(filter_factories):
+        # Returns the filters created by the factories, or None if
+        # any of them might create a filter the chain cannot apply.
+        for factory in filter_factories:
+            factory = getattr(factory, "__wrapped__", factory)
+            if isinstance(factory, type):
+                if factory not in _CHAIN_FILTERS:
+                    return None
+            elif not isinstance(factory, _CHAIN_FACTORIES):
+                return None
+        instances = [factory(None) for factory in filter_factories]
+        if any(type(instance) not in _CHAIN_FILTERS for instance in instances):
+            return None
+        return instances
+
+    @classmethod
+    def from_filters(cls, tokenizer_lang, filter_factories, language=None):
+        """Returns a chain applying the filters made by the factories.
+
+        The words are split with the PyEnchant tokenizer for the
+        language, unless another tokenizer is given. Returns None if
+        the chain cannot apply one of the filters, or there is no
+        suitable tokenizer for the language, and the filters should be
+        used with get_tokenizer() instead.
+        """
+        if language is None:
+            language = cls._get_language(tokenizer_lang)
+        if language is None:
+            return None
+        instances = cls._get_instances(filter_factories)
+        if instances is None:
+            return None
+        stages = []
+        for instance in instances:
+            skip = instance._skip
+            if getattr(skip, "__func__", None) is Filter._skip:
+                # The filter never skips anything.
+                skip = None
+            split = None
+            if isinstance(instance, ContractionFilter):
+                # The words split by ContractionFilter all contain an
+                # apostrophe, so the others are passed on as they are.
+                split = instance._split_words
+            stages.append((skip, split))
+        return cls(language, tuple(stages))
+
+    def with_filters(self, filter_factories):
+        """Returns a copy of the chain with more filters at the end.
+
+        Returns None if the chain cannot apply one of the filters.
+        """
+        instances = self._get_instances(filter_factories)
+        if instances is None or any(
+            isinstance(instance, ContractionFilter) for instance in instances
+        ):
+            return None
+        after = self._after + tuple(instance._skip for instance in instances)
+        return type(self)(self._language, self._stages, after)
+
+    @staticmethod
+    def _get_language(tag):
+        # Find the tokenizer for the language the same way as
+        # get_tokenizer().
+        tag = tag.replace("-", "_")
+        for name in (tag, tag.split("_")[0]):
+            try:
+                module = importlib.import_module(f"enchant.tokenize.{name}")
+            except ImportError:
+                continue
+            return getattr(module, "tokenize", None)
+        return None
+
+    def __call__(self, text):
+        "Yields the words to check in the text, with their positions."
+        strip_from_start = basic_tokenize.strip_from_start
+        strip_from_end = basic_tokenize.strip_from_end
+        stages = self._stages
+        after = self._after
+        for match in _NON_SPACE.finditer(text):
+            word = match.group()
+            stripped = word.lstrip(strip_from_start)
+            pos = match.start() + len(word) - len(stripped)
+            word = stripped.rstrip(strip_from_end)
+            if not word:
+                continue
+            for i, (skip, split) in enumerate(stages):
+                if skip is not None and skip(word):
+                    break
+                if split is not None and "'" in word:
+                    # Apply the rest of the chain to each part.
+                    words = []
+                    for part in split(word):
+                        self._apply(part, i + 1, words)
+                    for part in words:
+                        yield from self._split_language(part, pos)
+                    break
+            else:
+                if self._letters_unchanged and word.isalpha():
+                    for skip in after:
+                        if skip(word):
+                            break
+                    else:
+                        yield word, pos
+                else:
+                    yield from self._split_language(word, pos)
+
+    def _apply(self, word, start, words):
+        # Apply the stages from start on to the word, adding the
+        # words that are not skipped to words.
+        for i in range(start, len(self._stages)):
+            skip, split = self._stages[i]
+            if skip is not None and skip(word):
+                return
+            if split is not None and "'" in word:
+                for part in split(word):
+                    self._apply(part, i + 1, words)
+                return
+        words.append(word)
+
+    def _split_language(self, word, pos):
+        for part, offset in self._language(word):
+            for skip in self._after:
+                if skip(part):
+                    break
+            else:
+                yield part, pos + offset
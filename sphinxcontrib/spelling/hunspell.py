@@ -0,0 +1,183 @@
+"""Read the words from Hunspell dictionaries and plain word lists.
+
+Only the parts of the Hunspell format needed to list the words of a
+dictionary are supported: the flag types, flag aliases, prefixes and
+suffixes (including cross products), and the NEEDAFFIX,
+ONLYINCOMPOUND, and FORBIDDENWORD flags. Compounding rules,
+continuation classes, and the suggestion settings are ignored, so
+words that Hunspell would only accept as parts of compounds or after
+two suffixes are not listed.
+"""
+
+import codecs
+import collections
+import os
+import re
+
+_Affix = collections.namedtuple("_Affix", "strip add condition cross_product")
+
+
+class AffixFile:
+    """The affix rules used to expand the words of a dictionary."""
+
+    def __init__(self, filename=None):
+        self.encoding = "UTF-8"
+        self.flag_type = "short"
+        self.aliases = []
+        self.prefixes = collections.defaultdict(list)
+        self.suffixes = collections.defaultdict(list)
+        self.need_affix = None
+        self.only_in_compound = None
+        self.forbidden_word = None
+        if filename is not None:
+            self._read(filename)
+
+    def _read(self, filename):
+        # The encoding is given inside the file, so look for it first.
+        with open(filename, "rb") as f:
+            for line in f:
+                if line.startswith(b"SET "):
+                    encoding = line.split()[1].decode("ascii")
+                    try:
+                        codecs.lookup(encoding)
+                    except LookupError:
+                        pass
+                    else:
+                        self.encoding = encoding
+                    break
+        with open(filename, encoding=self.encoding, errors="replace") as f:
+            lines = [line.split() for line in f]
+        cross_products = {}
+        for fields in lines:
+            if not fields or fields[0].startswith("#"):
+                continue
+            keyword = fields[0]
+            if keyword == "FLAG" and len(fields) > 1:
+                self.flag_type = fields[1]
+            elif keyword == "AF" and len(fields) > 1 and not fields[1].isdigit():
+                self.aliases.append(fields[1])
+            elif keyword == "NEEDAFFIX" and len(fields) > 1:
+                self.need_affix = fields[1]
+            elif keyword == "ONLYINCOMPOUND" and len(fields) > 1:
+                self.only_in_compound = fields[1]
+            elif keyword == "FORBIDDENWORD" and len(fields) > 1:
+                self.forbidden_word = fields[1]
+            elif keyword in ("PFX", "SFX") and len(fields) >= 4:
+                affixes = self.prefixes if keyword == "PFX" else self.suffixes
+                flag = fields[1]
+                if fields[2] in ("Y", "N") and fields[3].isdigit():
+                    # The header of a group of rules.
+                    cross_products[keyword, flag] = fields[2] == "Y"
+                    continue
+                cross_product = cross_products.get((keyword, flag), False)
+                strip = "" if fields[2] == "0" else fields[2]
+                # Continuation classes after the slash are ignored.
+                add = fields[3].split("/", 1)[0]
+                add = "" if add == "0" else add
+                condition = fields[4] if len(fields) > 4 else "."
+                if condition == ".":
+                    pattern = None
+                elif keyword == "PFX":
+                    pattern = re.compile(condition)
+                else:
+                    pattern = re.compile(f"(?:{condition})$")
+                affixes[flag].append(_Affix(strip, add, pattern, cross_product))
+
+    def split_flags(self, flags):
+        "Returns the list of flags in the flags field of a word."
+        if self.aliases and flags.isdigit():
+            index = int(flags) - 1
+            if 0 <= index < len(self.aliases):
+                flags = self.aliases[index]
+        if self.flag_type == "long":
+            return [flags[i : i + 2] for i in range(0, len(flags), 2)]
+        if self.flag_type == "num":
+            return flags.split(",")
+        return list(flags)
+
+    def expand(self, word, flags):
+        "Yields the word and the forms made by adding affixes to it."
+        flags = self.split_flags(flags)
+        if self.forbidden_word in flags or self.only_in_compound in flags:
+            return
+        if self.need_affix not in flags:
+            yield word
+
+        suffixed = []
+        for flag in flags:
+            for affix in self.suffixes.get(flag, ()):
+                if not word.endswith(affix.strip):
+                    continue
+                if affix.condition is not None and not affix.condition.search(word):
+                    continue
+                new_word = word[: len(word) - len(affix.strip)] + affix.add
+                yield new_word
+                if affix.cross_product:
+                    suffixed.append(new_word)
+
+        for flag in flags:
+            for affix in self.prefixes.get(flag, ()):
+                if not word.startswith(affix.strip):
+                    continue
+                if affix.condition is not None and not affix.condition.match(word):
+                    continue
+                yield affix.add + word[len(affix.strip) :]
+                if affix.cross_product:
+                    for new_word in suffixed:
+                        if new_word.startswith(affix.strip):
+                            yield affix.add + new_word[len(affix.strip) :]
+
+
+def _split_entry(line):
+    # Returns the word and the flags from a line of a .dic file,
+    # ignoring any morphological fields after the word. Slashes in
+    # words are escaped with a backslash.
+    entry = line.split("\t", 1)[0].split(" ", 1)[0].strip()
+    word, flags = entry, ""
+    pos = entry.find("/")
+    while pos > 0 and entry[pos - 1] == "\\":
+        pos = entry.find("/", pos + 1)
+    if pos >= 0:
+        word, flags = entry[:pos], entry[pos + 1 :]
+    return word.replace("\\/", "/"), flags
+
+
+def read_dictionary(dic_filename, aff_filename=None):
+    """Yields the words in a Hunspell dictionary.
+
+    If the name of the affix file is not given, the file with the same
+    base name as the dictionary and the extension ``.aff`` is used if
+    it exists.
+    """
+    if aff_filename is None:
+        aff_filename = os.path.splitext(dic_filename)[0] + ".aff"
+        if not os.path.exists(aff_filename):
+            aff_filename = None
+    affixes = AffixFile(aff_filename)
+    with open(dic_filename, encoding=affixes.encoding, errors="replace") as f:
+        first = True
+        for line in f:
+            if first:
+                first = False
+                # The first line is the approximate number of words.
+                if line.strip().isdigit():
+                    continue
+            word, flags = _split_entry(line)
+            if word:
+                yield from affixes.expand(word, flags)
+
+
+def read_word_list(filename):
+    "Yields the words in a file with one word on each line."
+    with open(filename, encoding="UTF-8") as f:
+        for line in f:
+            word = line.strip()
+            if word and not word.startswith("#"):
+                yield word
+
+
+def read_words(filename):
+    "Yields the words from a Hunspell dictionary or a plain word list."
+    if filename.endswith(".dic"):
+        return read_dictionary(filename)
+    return read_word_list(filename)
@@ -0,0 +1,130 @@
+"""Timings and counters describing where a build spends its time."""
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+
+class Profile:
+    """Collects wall time and counts of events during a build.
+
+    Time is accumulated per named phase, along with the number of
+    times each phase was entered. Counters are kept for anything else
+    worth knowing, and the time spent checking each document is
+    recorded separately. The profiles of worker processes are
+    combined with the main one using merge(). Times and counts may
+    be recorded by several threads at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        "Forget everything recorded so far."
+        self.timings = {}
+        self.counters = collections.Counter()
+        self.documents = {}
+
+    def add_time(self, name, seconds, calls=1):
+        "Record time spent in the named phase."
+        with self._lock:
+            entry = self.timings.setdefault(name, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        "Record the time spent running the body of the with statement."
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        "Increase the named counter."
+        with self._lock:
+            self.counters[name] += n
+
+    def timed(self, name, func):
+        "Returns a wrapper for func recording the time spent calling it."
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwds):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwds)
+            finally:
+                self.add_time(name, time.perf_counter() - start)
+
+        return wrapper
+
+    def wrap_filter(self, filter_):
+        """Returns a filter factory recording the work done by filter_.
+
+        The time spent creating the filter is recorded, and the words
+        it skips are counted, using the name of the filter class.
+        """
+        name = getattr(filter_, "__name__", type(filter_).__name__)
+        name = name.removesuffix("Factory")
+
+        def factory(tokenizer):
+            with self.timer(f"filter {name}: construct"):
+                instance = filter_(tokenizer)
+            skip = instance._skip
+
+            def _skip(word):
+                if skip(word):
+                    self.count(f"skipped by {name}")
+                    return True
+                return False
+
+            # Filter.__call__() looks the method up on the instance
+            # each time a tokenizer is wrapped, so this replaces it.
+            instance._skip = _skip
+            return instance
+
+        # Lets FilterChain see which filter is being profiled.
+        factory.__wrapped__ = filter_
+        return factory
+
+    def as_dict(self):
+        "Returns the profile as a dictionary that can be saved as JSON."
+        return {
+            "timings": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in sorted(self.timings.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "documents": dict(sorted(self.documents.items())),
+        }
+
+    def merge(self, data):
+        "Add the values from a dictionary created by as_dict()."
+        for name, entry in data["timings"].items():
+            self.add_time(name, entry["seconds"], entry["calls"])
+        self.counters.update(data["counters"])
+        self.documents.update(data["documents"])
+
+    def format_table(self, max_documents=10):
+        "Returns lines of text summarizing the profile."
+        lines = [f"{'phase':<44} {'calls':>9} {'seconds':>10}"]
+        for name, (calls, seconds) in sorted(self.timings.items()):
+            lines.append(f"{name:<44} {calls:>9} {seconds:>10.3f}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<44} {'value':>20}")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"{name:<44} {value:>20}")
+        if self.documents:
+            slowest = sorted(
+                self.documents.items(), key=lambda item: item[1], reverse=True
+            )[:max_documents]
+            lines.append("")
+            lines.append(f"{'slowest documents':<44} {'seconds':>20}")
+            for docname, seconds in slowest:
+                lines.append(f"{docname:<44} {seconds:>20.3f}")
+        return lines
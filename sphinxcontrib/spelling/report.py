@@ -0,0 +1,135 @@
+"""Consolidated reports of the misspellings found in a project.
+
+Each misspelling is described by a record, a dictionary with the name
+of the document, the source file and line, the word, the suggested
+alternate spellings, and the line of text containing the word. All of
+the records of a build are written to a single file in the output
+directory, so tools do not need to find and parse a file per
+document.
+"""
+
+import importlib.metadata
+import json
+import os
+
+
+class JSONLinesReport:
+    """Write one JSON object per line for each misspelling."""
+
+    name = "jsonl"
+    basename = "spelling.jsonl"
+
+    def __init__(self, outdir):
+        self.filename = os.path.join(outdir, self.basename)
+
+    def load(self):
+        """Returns the records saved by an earlier build.
+
+        Returns an empty list if there is no usable report.
+        """
+        try:
+            with open(self.filename, encoding="UTF-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return []
+
+    def save(self, records):
+        "Replace the report with the records."
+        with open(self.filename + ".tmp", "w", encoding="UTF-8") as f:
+            self._write(f, records)
+        os.replace(self.filename + ".tmp", self.filename)
+
+    def _write(self, f, records):
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+
+
+class SARIFReport(JSONLinesReport):
+    """Write the misspellings as a SARIF 2.1.0 log.
+
+    Each misspelling is a result of the "misspelling" rule, with the
+    parts of the record that do not fit in the location of the result
+    saved in its property bag.
+    """
+
+    name = "sarif"
+    basename = "spelling.sarif"
+
+    rule_id = "misspelling"
+
+    def load(self):
+        try:
+            with open(self.filename, encoding="UTF-8") as f:
+                log = json.load(f)
+            return [
+                self._result_to_record(result)
+                for run in log["runs"]
+                for result in run["results"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+
+    def _write(self, f, records):
+        log = {
+            "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+            "version": "2.1.0",
+            "runs": [
+                {
+                    "tool": {
+                        "driver": {
+                            "name": "sphinxcontrib-spelling",
+                            "version": importlib.metadata.version(
+                                "sphinxcontrib-spelling"
+                            ),
+                            "informationUri": (
+                                "https://sphinxcontrib-spelling.readthedocs.io/"
+                            ),
+                            "rules": [
+                                {
+                                    "id": self.rule_id,
+                                    "shortDescription": {"text": "Misspelled word"},
+                                }
+                            ],
+                        }
+                    },
+                    "results": [self._record_to_result(r) for r in records],
+                }
+            ],
+        }
+        json.dump(log, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+    def _record_to_result(self, record):
+        location = {"artifactLocation": {"uri": record["source"].replace(os.sep, "/")}}
+        if record["line"] is not None:
+            location["region"] = {"startLine": record["line"]}
+        return {
+            "ruleId": self.rule_id,
+            "level": "warning",
+            "message": {"text": f"Misspelled word: {record['word']}"},
+            "locations": [{"physicalLocation": location}],
+            "properties": {
+                "document": record["document"],
+                "word": record["word"],
+                "suggestions": record["suggestions"],
+                "context": record["context"],
+            },
+        }
+
+    def _result_to_record(self, result):
+        location = result["locations"][0]["physicalLocation"]
+        properties = result["properties"]
+        return {
+            "document": properties["document"],
+            "source": location["artifactLocation"]["uri"].replace("/", os.sep),
+            "line": location.get("region", {}).get("startLine"),
+            "word": properties["word"],
+            "suggestions": properties["suggestions"],
+            "context": properties["context"],
+        }
+
+
+# The formats of consolidated reports, by the name used in the
+# spelling_output_format option.
+FORMATS = {cls.name: cls for cls in (JSONLinesReport, SARIFReport)}
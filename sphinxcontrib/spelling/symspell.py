@@ -0,0 +1,348 @@
+"""Suggest alternate spellings using a precomputed index of deletions.
+
+This follows the Symmetric Delete approach used by SymSpell. Every
+string that can be made by deleting up to max_distance letters from
+the start of a dictionary word is stored in an index pointing back to
+the words. To find suggestions for a misspelled word, the same
+deletions are made from it and looked up in the index, and the
+candidates found are ranked by their edit distance from the word.
+
+The index is saved to a file that is memory-mapped when it is used
+again, so it only has to be built when the dictionary changes.
+"""
+
+import array
+import hashlib
+import itertools
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from sphinx.util import logging
+
+from . import cache, hunspell
+
+logger = logging.getLogger(__name__)
+
+# Size of the unsigned integers used for offsets, slots, and postings.
+_ITEMSIZE = array.array("I").itemsize
+
+
+def deletes(word, max_distance):
+    "Returns the strings made by deleting up to max_distance letters."
+    result = {word}
+    edits = [word]
+    for _ in range(max_distance):
+        new_edits = []
+        for edit in edits:
+            for i in range(len(edit)):
+                candidate = edit[:i] + edit[i + 1 :]
+                if candidate not in result:
+                    result.add(candidate)
+                    new_edits.append(candidate)
+        edits = new_edits
+    return result
+
+
+def distance(a, b, max_distance):
+    """Returns the edit distance between two strings.
+
+    Insertions, deletions, substitutions, and transpositions of
+    adjacent letters each count as one edit (the optimal string
+    alignment distance). Any distance above max_distance is reported
+    as max_distance + 1.
+
+    The distance is computed with the bit-parallel algorithm from
+    Hyyrö, "A bit-vector algorithm for computing Levenshtein and
+    Damerau edit distances", which handles a whole column of the
+    usual dynamic programming table at once using integers as bit
+    vectors.
+    """
+    m = len(a)
+    if abs(m - len(b)) > max_distance:
+        return max_distance + 1
+    if not m:
+        return min(len(b), max_distance + 1)
+    # The positions of each letter in a, as bit masks.
+    peq = {}
+    bit = 1
+    for c in a:
+        peq[c] = peq.get(c, 0) | bit
+        bit <<= 1
+    mask = bit - 1
+    last = bit >> 1
+    pv = mask
+    mv = 0
+    d0 = 0
+    pm_prev = 0
+    score = m
+    for c in b:
+        pm = peq.get(c, 0)
+        tr = (((~d0) & pm) << 1) & pm_prev
+        d0 = ((((pm & pv) + pv) ^ pv) | pm | mv | tr) & mask
+        hp = (mv | ~(d0 | pv)) & mask
+        hn = d0 & pv
+        if hp & last:
+            score += 1
+        elif hn & last:
+            score -= 1
+        hp = ((hp << 1) | 1) & mask
+        hn = (hn << 1) & mask
+        pv = (hn | ~(d0 | hp)) & mask
+        mv = hp & d0
+        pm_prev = pm
+    return min(score, max_distance + 1)
+
+
+def _encode(word):
+    return word.encode("utf-8", "surrogatepass")
+
+
+class SuggestionIndex:
+    """Find dictionary words within a few edits of a misspelled word.
+
+    Only the first prefix_length letters of each word are used to make
+    the deletions, which keeps the index small, and the candidates are
+    then compared with the whole word. Suggestions are ranked by edit
+    distance, then by whether they use the same letters as the word,
+    then by the difference in length, and then alphabetically. At
+    most limit of them are returned (all of them when limit is 0).
+    """
+
+    _magic = b"SPSUGGS1"
+    # magic, byte order, max distance, prefix length, number of words,
+    # size of the words, number of keys, size of the keys, number of
+    # slots, number of postings
+    _header = struct.Struct("=8s8sQQQQQQQQ")
+
+    # Bump this when the way the index is built changes, so old saved
+    # indexes are not used.
+    version = 1
+
+    def __init__(self, buffers, max_distance, prefix_length, limit=0):
+        (
+            self._word_offsets,
+            self._word_data,
+            self._key_offsets,
+            self._key_data,
+            self._slots,
+            self._posting_offsets,
+            self._postings,
+        ) = buffers
+        self._mask = len(self._slots) - 1
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.limit = limit
+        # Used to keep the suggestions of different engines apart in
+        # the verdict cache.
+        self.cache_key = f"symspell:{max_distance}:{prefix_length}:{limit}"
+
+    @classmethod
+    def from_words(cls, words, max_distance=2, prefix_length=7, limit=0):
+        "Returns a new index of the words."
+        words = sorted(set(words))
+        index = {}
+        for i, word in enumerate(words):
+            for key in deletes(word.lower()[:prefix_length], max_distance):
+                index.setdefault(key, []).append(i)
+        keys = [_encode(key) for key in index]
+        nslots = 1 << max(3, (2 * len(keys)).bit_length())
+        mask = nslots - 1
+        slots = array.array("I", bytes(_ITEMSIZE * nslots))
+        for i, key in enumerate(keys, 1):
+            h = zlib.crc32(key) & mask
+            while slots[h]:
+                h = (h + 1) & mask
+            slots[h] = i
+        encoded_words = [_encode(word) for word in words]
+        word_offsets = array.array("I", [0])
+        word_offsets.extend(itertools.accumulate(len(w) for w in encoded_words))
+        key_offsets = array.array("I", [0])
+        key_offsets.extend(itertools.accumulate(len(key) for key in keys))
+        posting_offsets = array.array("I", [0])
+        posting_offsets.extend(itertools.accumulate(len(p) for p in index.values()))
+        postings = array.array("I", itertools.chain.from_iterable(index.values()))
+        buffers = (
+            word_offsets,
+            b"".join(encoded_words),
+            key_offsets,
+            b"".join(keys),
+            slots,
+            posting_offsets,
+            postings,
+        )
+        return cls(buffers, max_distance, prefix_length, limit)
+
+    @classmethod
+    def load(cls, filename, limit=0):
+        """Returns the index saved in the file, without copying it.
+
+        Raises ValueError if the file does not contain a complete index
+        saved on a platform with the same byte order.
+        """
+        with open(filename, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = cls._header.unpack_from(buf)
+        except struct.error:
+            raise ValueError(
+                f"{filename} does not contain a suggestion index"
+            ) from None
+        magic, byteorder, max_distance, prefix_length = header[:4]
+        nwords, words_size, nkeys, keys_size, nslots, npostings = header[4:]
+        if magic != cls._magic or byteorder.rstrip(b"\0") != sys.byteorder.encode():
+            raise ValueError(f"{filename} does not contain a suggestion index")
+        sizes = (
+            (_ITEMSIZE * (nwords + 1), "I"),
+            (words_size, None),
+            (_ITEMSIZE * (nkeys + 1), "I"),
+            (keys_size, None),
+            (_ITEMSIZE * nslots, "I"),
+            (_ITEMSIZE * (nkeys + 1), "I"),
+            (_ITEMSIZE * npostings, "I"),
+        )
+        if len(buf) < cls._header.size + sum(size for size, _ in sizes):
+            raise ValueError(f"{filename} is truncated")
+        view = memoryview(buf)
+        pos = cls._header.size
+        buffers = []
+        for size, typecode in sizes:
+            chunk = view[pos : pos + size]
+            buffers.append(chunk.cast(typecode) if typecode else chunk)
+            pos += size
+        return cls(buffers, max_distance, prefix_length, limit)
+
+    def save(self, filename):
+        "Write the index to the file, in a form that load() can map."
+        with open(filename, "wb") as f:
+            f.write(
+                self._header.pack(
+                    self._magic,
+                    sys.byteorder.encode(),
+                    self.max_distance,
+                    self.prefix_length,
+                    len(self._word_offsets) - 1,
+                    len(self._word_data),
+                    len(self._key_offsets) - 1,
+                    len(self._key_data),
+                    len(self._slots),
+                    len(self._postings),
+                )
+            )
+            f.write(self._word_offsets.tobytes())
+            f.write(self._word_data)
+            f.write(self._key_offsets.tobytes())
+            f.write(self._key_data)
+            f.write(self._slots.tobytes())
+            f.write(self._posting_offsets.tobytes())
+            f.write(self._postings.tobytes())
+
+    @classmethod
+    def from_files(
+        cls, filenames, cache_dir=None, max_distance=2, prefix_length=7, limit=0
+    ):
+        """Returns an index of the words in the dictionary files.
+
+        The files are read with hunspell.read_words(), and missing
+        files are ignored. When a cache directory is given, the index
+        is saved there, and loaded again as long as the files do not
+        change.
+        """
+        filenames = [f for f in filenames if f is not None]
+        h = hashlib.sha256()
+        h.update(f"{cls.version}:{max_distance}:{prefix_length}".encode())
+        for filename in filenames:
+            affix_filename = os.path.splitext(filename)[0] + ".aff"
+            h.update(cache.file_digest(filename, affix_filename).encode())
+        digest = h.hexdigest()[:16]
+
+        index = None
+        cache_filename = None
+        if cache_dir is not None:
+            cache_filename = os.path.join(cache_dir, f"suggestions-{digest}.index")
+            try:
+                index = cls.load(cache_filename, limit)
+            except (OSError, ValueError):
+                pass
+        if index is None:
+            index = cls.from_words(
+                cls._read_files(filenames), max_distance, prefix_length, limit
+            )
+            if cache_filename is not None:
+                logger.info("Saving suggestion index to %s", cache_filename)
+                os.makedirs(cache_dir, exist_ok=True)
+                index.save(cache_filename + ".tmp")
+                os.replace(cache_filename + ".tmp", cache_filename)
+        index.cache_key = f"symspell:{digest}:{limit}"
+        return index
+
+    @staticmethod
+    def _read_files(filenames):
+        for filename in filenames:
+            if os.path.exists(filename):
+                yield from hunspell.read_words(filename)
+
+    def __len__(self):
+        return len(self._word_offsets) - 1
+
+    def _word(self, i):
+        offsets = self._word_offsets
+        return bytes(self._word_data[offsets[i] : offsets[i + 1]]).decode(
+            "utf-8", "surrogatepass"
+        )
+
+    def _lookup(self, key):
+        # Returns the numbers of the words with the deletion key.
+        key = _encode(key)
+        key_data = self._key_data
+        key_offsets = self._key_offsets
+        slots = self._slots
+        mask = self._mask
+        h = zlib.crc32(key) & mask
+        while True:
+            i = slots[h]
+            if not i:
+                return ()
+            if key_data[key_offsets[i - 1] : key_offsets[i]] == key:
+                return self._postings[
+                    self._posting_offsets[i - 1] : self._posting_offsets[i]
+                ]
+            h = (h + 1) & mask
+
+    def suggest(self, word):
+        "Returns a list of suggested alternate spellings for the word."
+        lower = word.lower()
+        candidates = set()
+        for key in deletes(lower[: self.prefix_length], self.max_distance):
+            candidates.update(self._lookup(key))
+        letters = sorted(lower)
+        ranked = []
+        for i in candidates:
+            candidate = self._word(i)
+            if candidate == word:
+                continue
+            candidate_lower = candidate.lower()
+            d = distance(lower, candidate_lower, self.max_distance)
+            if d <= self.max_distance:
+                # Without word frequencies to go on, prefer words with
+                # the same letters, since swapping letters is a common
+                # typing mistake.
+                ranked.append(
+                    (
+                        d,
+                        sorted(candidate_lower) != letters,
+                        abs(len(candidate) - len(word)),
+                        candidate,
+                    )
+                )
+        ranked.sort()
+        if self.limit > 0:
+            ranked = ranked[: self.limit]
+        # Match the capitalization at the start of a sentence.
+        capitalize = word[:1].isupper() and word[1:].islower()
+        return [
+            candidate.capitalize() if capitalize and candidate.islower() else candidate
+            for *_, candidate in ranked
+        ]
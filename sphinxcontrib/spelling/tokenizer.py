@@ -0,0 +1,65 @@
+#
+# Copyright (c) 2010 Doug Hellmann.  All rights reserved.
+#
+"""Split words into the parts checked by the dictionary.
+
+The tokenizers for each language in PyEnchant look at the text one
+character at a time in Python. RegexTokenizer finds the same words
+using a single compiled regular expression for each language.
+"""
+
+import importlib
+import re
+
+from enchant.tokenize import basic_tokenize, wrap_tokenizer
+
+# The characters allowed inside words, other than letters, by the
+# name of the PyEnchant tokenizer module for each language.
+VALID_CHARS = {
+    "en": "'",
+    "de": "-.",
+}
+
+
+class RegexTokenizer:
+    """Split text into words the way the PyEnchant tokenizer does.
+
+    A word starts with a letter, and continues with letters and the
+    other characters allowed by the language, but does not end with
+    one of those other characters. For text made only of ASCII
+    characters, the words are found with a regular expression. Other
+    text may contain combining marks, which are kept with the letters
+    before them, so it is passed to the PyEnchant tokenizer instead.
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+        tag = tag.replace("-", "_")
+        for name in (tag, tag.split("_")[0]):
+            if name in VALID_CHARS:
+                break
+        else:
+            raise ValueError(
+                f"No regular expression tokenizer for language {self.tag!r}, "
+                f"expected one of {list(VALID_CHARS)}"
+            )
+        self.fallback = importlib.import_module(f"enchant.tokenize.{name}").tokenize
+        valid = re.escape(VALID_CHARS[name])
+        self._pattern = re.compile(f"[A-Za-z](?:[{valid}]*[A-Za-z])*")
+
+    def __call__(self, text):
+        "Yields the words in the text, with their positions."
+        if not text.isascii():
+            return self.fallback(text)
+        return ((m.group(), m.start()) for m in self._pattern.finditer(text))
+
+    def wrap(self, filters):
+        """Returns a tokenizer applying the filters, then this one.
+
+        This is the same as the tokenizer from get_tokenizer(), with
+        this tokenizer in place of the one for the language.
+        """
+        tokenizer = basic_tokenize
+        for f in filters:
+            tokenizer = f(tokenizer)
+        return wrap_tokenizer(tokenizer, self)
@@ -0,0 +1,164 @@
+"""Compact, immutable sets of words."""
+
+import array
+import hashlib
+import itertools
+import mmap
+import struct
+import sys
+import zlib
+
+# Size of the unsigned integers used for offsets and hash table slots.
+_ITEMSIZE = array.array("I").itemsize
+
+
+class WordSet:
+    """An immutable set of words stored in a few flat buffers.
+
+    The words are encoded as UTF-8 and concatenated into one buffer,
+    with an array of offsets marking where each one ends and an open
+    addressing hash table of word numbers used to find them. Only the
+    buffers are Python objects, so a set of hundreds of thousands of
+    words needs a fraction of the memory of a set of strings.
+
+    A set can be saved to a file using the same layout and
+    memory-mapped again later, so loading it takes almost no time and
+    the pages are shared by all of the processes using the file.
+    """
+
+    _magic = b"SPWORDS1"
+    # magic, byte order, number of words, number of slots, size of data
+    _header = struct.Struct("=8s8sQQQ")
+
+    def __init__(self, data, offsets, slots):
+        self._data = data
+        self._offsets = offsets
+        self._slots = slots
+        self._mask = len(slots) - 1
+
+    @classmethod
+    def from_words(cls, words):
+        "Returns a new WordSet containing the words."
+        encoded = sorted({word.encode("utf-8", "surrogatepass") for word in words})
+        offsets = array.array("I", [0])
+        offsets.extend(itertools.accumulate(len(word) for word in encoded))
+        # Keep the table at most half full, so lookups rarely need
+        # to look at more than one or two slots.
+        nslots = 1 << max(3, (2 * len(encoded)).bit_length())
+        mask = nslots - 1
+        slots = array.array("I", bytes(_ITEMSIZE * nslots))
+        for i, word in enumerate(encoded, 1):
+            h = zlib.crc32(word) & mask
+            while slots[h]:
+                h = (h + 1) & mask
+            slots[h] = i
+        return cls(b"".join(encoded), offsets, slots)
+
+    @classmethod
+    def load(cls, filename):
+        """Returns the WordSet saved in the file, without copying it.
+
+        Raises ValueError if the file does not contain a complete word
+        set saved on a platform with the same byte order.
+        """
+        with open(filename, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = cls._header.unpack_from(buf)
+        except struct.error:
+            raise ValueError(f"{filename} does not contain a usable word set") from None
+        magic, byteorder, count, nslots, size = header
+        if magic != cls._magic or byteorder.rstrip(b"\0") != sys.byteorder.encode():
+            raise ValueError(f"{filename} does not contain a usable word set")
+        expected = cls._header.size + _ITEMSIZE * (count + 1 + nslots) + size
+        if len(buf) < expected:
+            raise ValueError(f"{filename} is truncated")
+        view = memoryview(buf)
+        start = cls._header.size
+        end = start + _ITEMSIZE * (count + 1)
+        offsets = view[start:end].cast("I")
+        start, end = end, end + _ITEMSIZE * nslots
+        slots = view[start:end].cast("I")
+        data = view[end : end + size]
+        return cls(data, offsets, slots)
+
+    def save(self, filename):
+        "Write the set to the file, in a form that load() can map."
+        with open(filename, "wb") as f:
+            f.write(
+                self._header.pack(
+                    self._magic,
+                    sys.byteorder.encode(),
+                    len(self),
+                    len(self._slots),
+                    len(self._data),
+                )
+            )
+            f.write(self._offsets.tobytes())
+            f.write(self._slots.tobytes())
+            f.write(self._data)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __contains__(self, word):
+        try:
+            key = word.encode("utf-8", "surrogatepass")
+        except AttributeError:
+            return False
+        data = self._data
+        offsets = self._offsets
+        slots = self._slots
+        mask = self._mask
+        h = zlib.crc32(key) & mask
+        while True:
+            i = slots[h]
+            if not i:
+                return False
+            if data[offsets[i - 1] : offsets[i]] == key:
+                return True
+            h = (h + 1) & mask
+
+    def contains_many(self, words):
+        "Returns a list with the result of testing each word for membership."
+        data = self._data
+        offsets = self._offsets
+        slots = self._slots
+        mask = self._mask
+        crc32 = zlib.crc32
+        results = []
+        for word in words:
+            try:
+                key = word.encode("utf-8", "surrogatepass")
+            except AttributeError:
+                results.append(False)
+                continue
+            h = crc32(key) & mask
+            while True:
+                i = slots[h]
+                if not i:
+                    results.append(False)
+                    break
+                if data[offsets[i - 1] : offsets[i]] == key:
+                    results.append(True)
+                    break
+                h = (h + 1) & mask
+        return results
+
+    def digest(self):
+        "Returns a hex digest of the words, which changes when they do."
+        h = hashlib.sha256()
+        h.update(self._offsets)
+        h.update(self._data)
+        return h.hexdigest()
+
+    def __iter__(self):
+        data = self._data
+        offsets = self._offsets
+        for i in range(len(self)):
+            yield bytes(data[offsets[i] : offsets[i + 1]]).decode(
+                "utf-8", "surrogatepass"
+            )
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} of {len(self)} words>"
@@ -5,13 +5,19 @@
 
 import contextlib
 import io
+import json
 import os
 import sys
 import textwrap
+import threading
 
 import pytest
 from sphinx.application import Sphinx
+from sphinx.builders import Builder
+from sphinx.environment import BuildEnvironment
+from sphinx.errors import ConfigError
 
+from sphinxcontrib.spelling.builder import SpellingBuilder  # isort:skip
 from tests import helpers  # isort:skip
 
 
@@ -60,7 +66,9 @@ def add_file(thedir, filename, content):
         f.write(textwrap.dedent(content))
 
 
-def get_sphinx_app(srcdir, outdir, docname, builder="spelling"):
+def get_sphinx_app(
+    srcdir, outdir, docname, builder="spelling", freshenv=True, parallel=0
+):
     stdout = io.StringIO()
     stderr = io.StringIO()
     app = Sphinx(
@@ -71,7 +79,8 @@ def get_sphinx_app(srcdir, outdir, docname, builder="spelling"):
         builder,
         status=stdout,
         warning=stderr,
-        freshenv=True,
+        freshenv=freshenv,
+        parallel=parallel,
     )
     return (stdout, stderr, app)
 
@@ -285,6 +294,43 @@ def test_multiple_word_list_list(tmpdir):
     assert os.path.basename(results[1]) == "test_wordlist2.txt"
 
 
+def test_combined_word_list(tmpdir):
+    srcdir, outdir, stdout, stderr, app = _wordlist_sphinx_project(
+        tmpdir,
+        """
+        extensions = ['sphinxcontrib.spelling']
+        spelling_word_list_filename=['test_wordlist.txt', 'test_wordlist2.txt']
+        """,
+    )
+    add_file(srcdir, "test_wordlist2.txt", "mispelled\n  txt\n\n")
+    combined = app.builder.get_wordlist_filename()
+    assert os.path.dirname(combined) == app.builder.get_cache_dir()
+    with open(combined, encoding="utf-8") as f:
+        assert f.read() == "mispelled\ntxt\n"
+    # The list is reused until one of the files changes.
+    assert app.builder.get_wordlist_filename() == combined
+    add_file(srcdir, "test_wordlist.txt", "txt\ntihs\n")
+    changed = app.builder.get_wordlist_filename()
+    assert changed != combined
+    combined_lists = [
+        name
+        for name in os.listdir(app.builder.get_cache_dir())
+        if name.startswith("wordlist-")
+    ]
+    assert combined_lists == [os.path.basename(changed)]
+
+
+def test_combined_word_list_missing_file(tmpdir):
+    with pytest.raises(FileNotFoundError):
+        _wordlist_sphinx_project(
+            tmpdir,
+            """
+            extensions = ['sphinxcontrib.spelling']
+            spelling_word_list_filename=['test_wordlist.txt', 'missing.txt']
+            """,
+        )
+
+
 def test_ignore_file(sphinx_project):
     srcdir, outdir = sphinx_project
     add_file(
@@ -490,6 +536,91 @@ def test_domain_directive(sphinx_project):
     assert output_text is None
 
 
+def test_domain_words_collected_as_set(sphinx_project):
+    srcdir, outdir = sphinx_project
+
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. spelling:word-list::
+
+       teh
+       tihs
+
+    :spelling:word:`teh` is OK, tihs too
+
+    """,
+    )
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert app.env.spelling_document_words["contents"] == frozenset(["teh", "tihs"])
+    assert not os.path.exists(os.path.join(outdir, "contents.spelling"))
+
+
+def test_domain_words_shared(sphinx_project):
+    srcdir, outdir = sphinx_project
+
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+       other
+       third
+
+    .. spelling:word-list::
+
+       teh
+       tihs
+       teh
+
+    """,
+    )
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    :spelling:word:`tihs teh` and :spelling:word:`teh`
+    """,
+    )
+    add_file(
+        srcdir,
+        "third.rst",
+        """
+    Third
+    =====
+
+    .. spelling:word-list::
+
+       wrods
+       teh
+    """,
+    )
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    document_words = app.env.spelling_document_words
+    assert document_words["contents"] == frozenset(["teh", "tihs"])
+    # Documents with the same words share a set, and each word is
+    # only kept once.
+    assert document_words["other"] is document_words["contents"]
+    assert document_words["third"] == frozenset(["teh", "wrods"])
+    (teh,) = [word for word in document_words["contents"] if word == "teh"]
+    assert any(word is teh for word in document_words["third"])
+
+
 def test_domain_role(sphinx_project):
     srcdir, outdir = sphinx_project
 
@@ -677,3 +808,778 @@ def test_only_directive(sphinx_project):
     )
     assert "(whaat)" in output_text
     assert "(teh)" not in output_text
+
+
+def _incremental_sphinx_project(srcdir, conf_contents=""):
+    # Without an index document, Sphinx changes root_doc when it
+    # starts, which looks like a configuration change to later builds
+    # and makes them read every document again.
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    root_doc = 'contents'
+    """
+        + conf_contents,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+       other
+
+    teh is not ok
+    """,
+    )
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    whaat is not ok
+    """,
+    )
+
+
+def record_checked_docs(monkeypatch):
+    "Returns a list collecting the names of the documents checked."
+    checked = []
+    find_misspellings = SpellingBuilder._find_misspellings
+
+    def recording(builder, docname, doctree):
+        checked.append(docname)
+        return find_misspellings(builder, docname, doctree)
+
+    monkeypatch.setattr(SpellingBuilder, "_find_misspellings", recording)
+    return checked
+
+
+def test_incremental_build(sphinx_project, monkeypatch):
+    srcdir, outdir = sphinx_project
+    _incremental_sphinx_project(srcdir)
+    checked = record_checked_docs(monkeypatch)
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert "Found 2 misspelled words" in stderr.getvalue()
+    assert sorted(checked) == ["contents", "other"]
+
+    # Nothing changed, so no documents need to be checked again, but
+    # the results from the first build are still counted.
+    checked.clear()
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    assert list(app.builder.get_outdated_docs()) == []
+    app.build()
+    assert "Found 2 misspelled words" in stderr.getvalue()
+    assert checked == []
+
+    # Fixing one document removes its results, and only that document
+    # is checked again.
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    what is ok
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    app.build()
+    assert "Found 1 misspelled words" in stderr.getvalue()
+    assert checked == ["other"]
+    assert not os.path.exists(os.path.join(outdir, "other.spelling"))
+    assert os.path.exists(os.path.join(outdir, "contents.spelling"))
+
+
+def test_incremental_build_word_list_changed(sphinx_project, monkeypatch):
+    srcdir, outdir = sphinx_project
+    _incremental_sphinx_project(srcdir)
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert "Found 2 misspelled words" in stderr.getvalue()
+
+    # Changing the word list invalidates the earlier results of all
+    # of the documents.
+    add_file(
+        srcdir,
+        "spelling_wordlist.txt",
+        """
+    teh
+    """,
+    )
+    checked = record_checked_docs(monkeypatch)
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    assert sorted(app.builder.get_outdated_docs()) == ["contents", "other"]
+    app.build()
+    assert "Found 1 misspelled words" in stderr.getvalue()
+    assert sorted(checked) == ["contents", "other"]
+
+
+def test_incremental_build_pypi_names_changed(sphinx_project, monkeypatch):
+    srcdir, outdir = sphinx_project
+    _incremental_sphinx_project(
+        srcdir,
+        """
+    spelling_ignore_pypi_package_names = True
+    spelling_pypi_package_names_filename = 'names.txt'
+    """,
+    )
+    add_file(srcdir, "names.txt", "setuptools\n")
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert "Found 2 misspelled words" in stderr.getvalue()
+
+    # Changing the words ignored by a filter invalidates the earlier
+    # results, even though the configuration is the same.
+    add_file(srcdir, "names.txt", "setuptools\nteh\n")
+    checked = record_checked_docs(monkeypatch)
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    assert sorted(app.builder.get_outdated_docs()) == ["contents", "other"]
+    app.build()
+    assert "Found 1 misspelled words" in stderr.getvalue()
+    assert sorted(checked) == ["contents", "other"]
+
+
+def test_parallel_build(sphinx_project):
+    srcdir, outdir = sphinx_project
+    docnames = ["one", "two", "three", "four"]
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+    """
+        + "".join(f"   {docname}\n" for docname in docnames),
+    )
+    for docname in docnames:
+        add_file(
+            srcdir,
+            f"{docname}.rst",
+            f"""
+    Title {docname}
+    ===============
+
+    teh is not ok
+    """,
+        )
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", parallel=4)
+    app.build()
+    # The results found by all of the worker processes are counted.
+    assert "Found 4 misspelled words" in stderr.getvalue()
+    for docname in docnames:
+        with open(os.path.join(outdir, f"{docname}.spelling")) as f:
+            assert "(teh)" in f.read()
+
+
+def test_suggestions_found_once_per_word(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_show_suggestions = True
+    spelling_memo_size = 0
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+       other
+
+    teh is not ok, teh
+    """,
+    )
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    teh again
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    calls = []
+    suggest = app.builder.checker._suggest_words
+    app.builder.checker._suggest_words = lambda word: (
+        calls.append(word) or suggest(word)
+    )
+    app.build()
+    assert calls == ["teh"]
+    assert "Found 3 misspelled words" in stderr.getvalue()
+    for docname in ["contents", "other"]:
+        with open(os.path.join(outdir, f"{docname}.spelling")) as f:
+            assert '(teh) ["' in f.read()
+
+
+@pytest.mark.skipif(
+    not hasattr(Builder, "write_documents"),
+    reason="suggestions are only deferred by write_documents()",
+)
+def test_parallel_build_suggestions(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_show_suggestions = True
+    spelling_output_format = 'jsonl'
+    """,
+    )
+    docnames = ["one", "two", "three", "four"]
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+    """
+        + "".join(f"   {docname}\n" for docname in docnames),
+    )
+    for docname in docnames:
+        add_file(
+            srcdir,
+            f"{docname}.rst",
+            f"""
+    Title {docname}
+    ===============
+
+    teh is not ok, {docname}x
+    """,
+        )
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", parallel=4)
+    app.build()
+    assert "Found 8 misspelled words" in stderr.getvalue()
+    with open(os.path.join(outdir, "spelling.jsonl")) as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(record["document"] for record in records) == sorted(docnames * 2)
+    for record in records:
+        assert record["suggestions"]
+
+
+def test_check_threads(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_show_suggestions = True
+    spelling_check_threads = 3
+    """,
+    )
+    docnames = ["one", "two", "three", "four", "five", "six", "seven"]
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+    """
+        + "".join(f"   {docname}\n" for docname in docnames),
+    )
+    for docname in docnames:
+        add_file(
+            srcdir,
+            f"{docname}.rst",
+            f"""
+    Title {docname}
+    ===============
+
+    .. spelling:word-list::
+
+       {docname}x
+
+    teh is not ok, {docname}x is
+    """,
+        )
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert "Found 7 misspelled words" in stderr.getvalue()
+    for docname in docnames:
+        with open(os.path.join(outdir, f"{docname}.spelling")) as f:
+            output = f.read()
+        assert '(teh) ["' in output
+        assert f"({docname}x)" not in output
+    assert not os.path.exists(os.path.join(outdir, "contents.spelling"))
+
+
+def test_check_threads_suggestions(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_show_suggestions = True
+    spelling_check_threads = 3
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh wrods arre nott spelled rihgt, teh
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    calls = []
+    suggest = app.builder.checker._suggest_words
+    app.builder.checker._suggest_words = lambda word: (
+        calls.append((word, threading.current_thread())) or suggest(word)
+    )
+    app.build()
+    assert "Found 6 misspelled words" in stderr.getvalue()
+    # Each distinct word is looked up once, by the pool of threads.
+    assert sorted(word for word, thread in calls) == [
+        "arre",
+        "nott",
+        "rihgt",
+        "teh",
+        "wrods",
+    ]
+    assert threading.main_thread() not in {thread for word, thread in calls}
+
+
+def test_profile(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_ignore_acronyms = True
+    spelling_ignore_wiki_words = False
+    spelling_show_suggestions = True
+    spelling_profile = True
+    spelling_profile_filename = 'profile.json'
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh is not ok, HTML is
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert "Spelling profile:" in stdout.getvalue()
+    with open(os.path.join(outdir, "profile.json")) as f:
+        profile = json.load(f)
+    assert profile["timings"]["init: checker"]["calls"] == 1
+    assert profile["timings"]["check documents"]["calls"] == 1
+    assert "contents" in profile["documents"]
+    assert profile["counters"]["skipped by AcronymFilter"] == 1
+    assert profile["counters"]["tokens checked"] > 0
+    assert profile["timings"]["dictionary suggest"]["calls"] == 1
+
+
+@pytest.mark.parametrize(
+    "setting",
+    [
+        "spelling_profile = True",
+        "spelling_verdict_cache = True",
+        "spelling_memo_size = 10",
+        "spelling_cache_dir = 'othercache'",
+    ],
+)
+def test_setting_does_not_change_signature(sphinx_project, setting):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh is not ok
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+
+    add_file(
+        srcdir,
+        "conf.py",
+        f"""
+    extensions = ['sphinxcontrib.spelling']
+    {setting}
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    assert list(app.builder.get_outdated_docs()) == []
+
+
+def test_jsonl_report(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_output_format = 'jsonl'
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+       other
+
+    teh is not ok
+    """,
+    )
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    whaat is not ok
+    """,
+    )
+
+    def get_records():
+        with open(os.path.join(outdir, "spelling.jsonl")) as f:
+            return [json.loads(line) for line in f]
+
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    assert "Found 2 misspelled words" in stderr.getvalue()
+    assert not os.path.exists(os.path.join(outdir, "contents.spelling"))
+    records = get_records()
+    assert [(r["document"], r["word"], r["line"]) for r in records] == [
+        ("contents", "teh", 9),
+        ("other", "whaat", 5),
+    ]
+    assert records[0]["context"] == "teh is not ok"
+
+    # Fixing one document removes its record and keeps the record of
+    # the document that was not checked again.
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    what is ok
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    app.build()
+    assert "Found 1 misspelled words" in stderr.getvalue()
+    assert [r["word"] for r in get_records()] == ["teh"]
+
+
+def test_sarif_report(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_output_format = 'sarif'
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh is not ok
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+    with open(os.path.join(outdir, "spelling.sarif")) as f:
+        log = json.load(f)
+    (result,) = log["runs"][0]["results"]
+    assert result["properties"]["word"] == "teh"
+    assert result["locations"][0]["physicalLocation"]["region"]["startLine"] == 5
+
+
+def test_unknown_output_format(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_output_format = 'xml'
+    """,
+    )
+    add_file(srcdir, "contents.rst", "Contents\n")
+    with pytest.raises(ConfigError):
+        get_sphinx_app(srcdir, outdir, "contents")
+
+
+@pytest.mark.skipif(
+    not hasattr(Builder, "write_documents"),
+    reason="excluded documents are only dropped by write_documents()",
+)
+def test_excluded_doctree_not_loaded(sphinx_project, monkeypatch):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_exclude_patterns = ['ignored_*']
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+       ignored_other
+
+    teh is not ok
+    """,
+    )
+    add_file(
+        srcdir,
+        "ignored_other.rst",
+        """
+    Other
+    =====
+
+    whaat is not ok
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    loaded = []
+    get_and_resolve_doctree = BuildEnvironment.get_and_resolve_doctree
+
+    # The environment is pickled during the build, so the method is
+    # replaced on the class instead of the instance.
+    def recording(env, docname, *args, **kwds):
+        loaded.append(docname)
+        return get_and_resolve_doctree(env, docname, *args, **kwds)
+
+    monkeypatch.setattr(BuildEnvironment, "get_and_resolve_doctree", recording)
+    app.build()
+    assert "Found 1 misspelled words" in stderr.getvalue()
+    assert "ignored_other" not in loaded
+    assert app.builder.document_state["ignored_other"]["misspellings"] == 0
+
+
+def test_current_doctree_not_loaded(sphinx_project, monkeypatch):
+    srcdir, outdir = sphinx_project
+    # Without an index document, Sphinx changes root_doc when it
+    # starts, which looks like a configuration change to later builds
+    # and makes them read every document again.
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    root_doc = 'contents'
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    .. toctree::
+
+       other
+
+    teh is not ok
+    """,
+    )
+    add_file(
+        srcdir,
+        "other.rst",
+        """
+    Other
+    =====
+
+    whaat is not ok
+    """,
+    )
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents")
+    app.build()
+
+    # Writing all of the documents again does not check any of them,
+    # and the earlier results are still reported.
+    stdout, stderr, app = get_sphinx_app(srcdir, outdir, "contents", freshenv=False)
+    loaded = []
+    get_and_resolve_doctree = BuildEnvironment.get_and_resolve_doctree
+
+    def recording(env, docname, *args, **kwds):
+        loaded.append(docname)
+        return get_and_resolve_doctree(env, docname, *args, **kwds)
+
+    monkeypatch.setattr(BuildEnvironment, "get_and_resolve_doctree", recording)
+    app.build(force_all=True)
+    assert loaded == []
+    assert "Found 2 misspelled words" in stderr.getvalue()
+    assert os.path.exists(os.path.join(outdir, "contents.spelling"))
+    assert os.path.exists(os.path.join(outdir, "other.spelling"))
+
+
+def test_memory_backend(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_backend = 'memory'
+    spelling_dictionary_filename = 'words.txt'
+    """,
+    )
+    add_file(srcdir, "words.txt", "the\nmodule\nis\nnot\nok\n")
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh is not ok
+    """,
+    )
+    stdout, stderr, output_text = get_sphinx_output(srcdir, outdir, "contents")
+    assert "(teh)" in output_text
+    assert "Found 1 misspelled words" in stderr.getvalue()
+
+
+def test_symspell_suggestions(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_show_suggestions = True
+    spelling_suggestion_engine = 'symspell'
+    spelling_dictionary_filename = 'words.txt'
+    """,
+    )
+    add_file(srcdir, "words.txt", "the\nmodule\nis\nnot\nok\n")
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh is not ok
+    """,
+    )
+    stdout, stderr, output_text = get_sphinx_output(srcdir, outdir, "contents")
+    assert '(teh) ["the"]' in output_text
+    assert os.listdir(os.path.join(outdir, ".spelling-cache"))
+
+
+def test_unknown_suggestion_engine(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_show_suggestions = True
+    spelling_suggestion_engine = 'no-such-engine'
+    """,
+    )
+    with pytest.raises(ConfigError):
+        get_sphinx_app(srcdir, outdir, "contents")
+
+
+def test_regex_tokenizer_engine(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_tokenizer_engine = 'regex'
+    """,
+    )
+    add_file(
+        srcdir,
+        "contents.rst",
+        """
+    The Module
+    ==========
+
+    teh front-end isn't ok
+    """,
+    )
+    stdout, stderr, output_text = get_sphinx_output(srcdir, outdir, "contents")
+    assert "(teh)" in output_text
+    assert "Found 1 misspelled words" in stderr.getvalue()
+
+
+def test_unknown_tokenizer_engine(sphinx_project):
+    srcdir, outdir = sphinx_project
+    add_file(
+        srcdir,
+        "conf.py",
+        """
+    extensions = ['sphinxcontrib.spelling']
+    spelling_tokenizer_engine = 'no-such-engine'
+    """,
+    )
+    with pytest.raises(ConfigError):
+        get_sphinx_app(srcdir, outdir, "contents")
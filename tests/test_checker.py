@@ -3,9 +3,13 @@
 #
 """Tests for SpellingChecker."""
 
+import concurrent.futures
 import os
 
-from sphinxcontrib.spelling.checker import SpellingChecker, line_of_index
+import pytest
+
+from sphinxcontrib.spelling import filters, profile, symspell
+from sphinxcontrib.spelling.checker import LineIndex, SpellingChecker, line_of_index
 
 
 def test_errors_only():
@@ -86,3 +90,354 @@ def test_line_of_index_multi_line():
     assert line_of_index(text, 13) == "bar baz"
 
     assert line_of_index(text, 14) == ""
+
+
+def test_line_index():
+    text = "\nfoo\n\nbar baz\n"
+    lines = LineIndex(text)
+    for index in range(len(text) + 1):
+        line_number = lines.line_number(index)
+        assert line_number == text.count("\n", 0, index)
+        assert lines.line(line_number) == line_of_index(text, index)
+
+
+def test_line_index_no_newlines():
+    lines = LineIndex("foo bar baz")
+    assert lines.line_number(5) == 0
+    assert lines.line(0) == "foo bar baz"
+
+
+def test_verdict_cache(tmpdir):
+    cache_filename = str(tmpdir.join("verdicts.sqlite"))
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=None,
+        cache_filename=cache_filename,
+    )
+    words = [word for word, suggestions, line, offset in checker.check("This txt")]
+    assert words == ["txt"]
+    checker.flush()
+
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=None,
+        cache_filename=cache_filename,
+    )
+    assert checker.verdicts.get("This") == (True, None)
+    correct, suggestions = checker.verdicts.get("txt")
+    assert not correct
+    assert suggestions
+
+
+def test_verdict_cache_invalidated_by_word_list(tmpdir):
+    cache_filename = str(tmpdir.join("verdicts.sqlite"))
+    word_list = tmpdir.join("wordlist.txt")
+    word_list.write("")
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=str(word_list),
+        cache_filename=cache_filename,
+    )
+    assert [word for word, *rest in checker.check("This txt")] == ["txt"]
+    checker.flush()
+
+    word_list.write("txt\n")
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=str(word_list),
+        cache_filename=cache_filename,
+    )
+    assert checker.verdicts.get("txt") is None
+    assert [word for word, *rest in checker.check("This txt")] == []
+
+
+def test_memo():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=None,
+    )
+    text = "This txt and that txt"
+    assert [word for word, *rest in checker.check(text)] == ["txt", "txt"]
+    info = checker.memo_info()
+    assert info["check"].misses == 4
+    assert info["check"].hits == 1
+    assert info["suggest"].misses == 1
+    assert info["suggest"].hits == 1
+
+
+def test_memo_with_pushed_filters():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+    )
+    assert [word for word, *rest in checker.check("This txt")] == ["txt"]
+
+    checker.push_filters([filters.IgnoreWordsFilterFactory(["txt"])])
+    assert [word for word, *rest in checker.check("This txt")] == []
+    checker.pop_filters()
+
+    assert [word for word, *rest in checker.check("This txt")] == ["txt"]
+
+
+def test_check_ignore():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+    )
+    tokenizer = checker.tokenizer
+    ignore = frozenset(["txt"])
+    assert [word for word, *rest in checker.check("This txt teh", ignore)] == ["teh"]
+    results = checker.check_many([("first", "This txt"), ("second", "teh")], ignore)
+    assert [word for key, word, *rest in results] == ["teh"]
+    assert checker.tokenizer is tokenizer
+    assert [word for word, *rest in checker.check("This txt")] == ["txt"]
+
+
+def test_check_from_threads(tmpdir):
+    p = profile.Profile()
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=None,
+        cache_filename=str(tmpdir.join("verdicts.sqlite")),
+        profile=p,
+    )
+    texts = ["This txt has teh wrods"] * 50
+    ignore = frozenset(["wrods"])
+
+    def check(text):
+        return [
+            (key, word) for key, word, *rest in checker.check_many([(0, text)], ignore)
+        ]
+
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(check, texts))
+    assert results == [[(0, "txt"), (0, "teh")]] * len(texts)
+    assert p.counters["tokens checked"] == 4 * len(texts)
+    assert p.counters["skipped by document words"] == len(texts)
+    checker.flush()
+    assert checker.verdicts.get("teh")[0] is False
+
+
+def test_dictionary():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+    )
+    assert checker.dictionary is checker.backend.dictionary
+    assert checker.dictionary.check("This")
+
+
+def test_memo_disabled():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+        memo_size=0,
+    )
+    assert [word for word, *rest in checker.check("txt txt")] == ["txt", "txt"]
+    assert checker.memo_info()["check"].hits == 0
+
+
+def test_check_many():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+        context_line=True,
+    )
+    items = [
+        ("first", "This txt is wrong"),
+        ("second", "Line one\nAnother txt\nand teh end"),
+        ("third", "Nothing wrong"),
+        ("fourth", "teh"),
+    ]
+    results = [
+        (key, word, line, offset)
+        for key, word, suggestions, line, offset in checker.check_many(items)
+    ]
+    assert results == [
+        ("first", "txt", "This txt is wrong", 0),
+        ("second", "txt", "Another txt", 1),
+        ("second", "teh", "and teh end", 2),
+        ("fourth", "teh", "teh", 0),
+    ]
+    # Each distinct word is only checked once.
+    assert checker.memo_info()["check"].hits == 0
+
+
+def test_check_many_empty():
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+    )
+    assert list(checker.check_many([])) == []
+    assert list(checker.check_many([("empty", "")])) == []
+
+
+def test_profile():
+    p = profile.Profile()
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=None,
+        filters=[filters.AcronymFilter],
+        profile=p,
+    )
+    checker.push_filters([filters.IgnoreWordsFilterFactory(["txt"])])
+    words = [word for word, suggestions, line, offset in checker.check("HTML txt teh")]
+    checker.pop_filters()
+    assert words == ["teh"]
+    assert p.counters["tokens checked"] == 1
+    assert p.counters["skipped by AcronymFilter"] == 1
+    assert p.counters["skipped by IgnoreWordsFilter"] == 1
+    assert p.timings["filter AcronymFilter: construct"][0] == 1
+    assert p.timings["dictionary check"][0] == 1
+    assert p.timings["dictionary suggest"][0] == 1
+
+
+def test_profile_merge():
+    main = profile.Profile()
+    main.add_time("check documents", 1.0)
+    main.count("tokens", 10)
+    worker = profile.Profile()
+    worker.add_time("check documents", 2.0, calls=3)
+    worker.count("tokens", 5)
+    worker.documents["other"] = 2.0
+    main.merge(worker.as_dict())
+    assert main.timings["check documents"] == [4, 3.0]
+    assert main.counters["tokens"] == 15
+    assert main.documents == {"other": 2.0}
+    assert "other" in "\n".join(main.format_table())
+
+
+@pytest.fixture
+def memory_dictionary(tmpdir):
+    filename = tmpdir.join("words.txt")
+    filename.write_text("this\nis\nwrong\nthe\ntext\ntea\nPython\n", encoding="utf-8")
+    return str(filename)
+
+
+def test_memory_backend(memory_dictionary, tmpdir):
+    word_list = tmpdir.join("spelling_wordlist.txt")
+    word_list.write_text("txt\n", encoding="utf-8")
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=str(word_list),
+        backend="memory",
+        dictionary_filename=memory_dictionary,
+    )
+    results = [
+        (word, suggestions)
+        for word, suggestions, line, offset in checker.check(
+            "This txt is WRONG, teh python Python PYTHON tEXT"
+        )
+    ]
+    assert results == [("teh", ["the", "tea"]), ("python", []), ("tEXT", [])]
+
+
+def test_memory_backend_check_many(memory_dictionary):
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+        backend="memory",
+        dictionary_filename=memory_dictionary,
+    )
+    items = [("first", "This is wrong"), ("second", "This is\nteh text")]
+    results = [
+        (key, word, offset)
+        for key, word, suggestions, line, offset in checker.check_many(items)
+    ]
+    assert results == [("second", "teh", 1)]
+
+
+def test_memory_backend_cache(memory_dictionary, tmpdir):
+    cache_dir = str(tmpdir.join("cache"))
+    for _ in range(2):
+        checker = SpellingChecker(
+            lang="en_US",
+            suggest=False,
+            word_list_filename=None,
+            backend="memory",
+            dictionary_filename=memory_dictionary,
+            cache_dir=cache_dir,
+        )
+        assert checker.backend.check("text")
+    (filename,) = os.listdir(cache_dir)
+    assert filename.startswith("dictionary-")
+
+
+def test_suggest_many(memory_dictionary):
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=False,
+        word_list_filename=None,
+        backend="memory",
+        dictionary_filename=memory_dictionary,
+    )
+    assert checker.suggest_many(["teh", "teh", "xyzzy"]) == {
+        "teh": ["the", "tea"],
+        "xyzzy": [],
+    }
+
+
+def test_symspell_suggester(memory_dictionary):
+    checker = SpellingChecker(
+        lang="en_US",
+        suggest=True,
+        word_list_filename=None,
+        backend="memory",
+        dictionary_filename=memory_dictionary,
+        suggester=symspell.SuggestionIndex.from_files([memory_dictionary]),
+    )
+    results = [
+        (word, suggestions)
+        for word, suggestions, line, offset in checker.check("This is teh text")
+    ]
+    assert results == [("teh", ["the", "tea", "text"])]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        SpellingChecker(
+            lang="en_US",
+            suggest=False,
+            word_list_filename=None,
+            backend="no-such-backend",
+        )
+
+
+def test_regex_tokenizer_engine():
+    results = {}
+    for engine in ("enchant", "regex"):
+        checker = SpellingChecker(
+            lang="en_US",
+            suggest=False,
+            word_list_filename=None,
+            filters=[filters.ContractionFilter],
+            tokenizer_engine=engine,
+        )
+        results[engine] = list(checker.check("It's a front-end that isn't tihs"))
+    assert results["regex"] == results["enchant"]
+    assert [word for word, *_ in results["regex"]] == ["tihs"]
+
+
+def test_unknown_tokenizer_engine():
+    with pytest.raises(ValueError):
+        SpellingChecker(
+            lang="en_US",
+            suggest=False,
+            word_list_filename=None,
+            tokenizer_engine="no-such-engine",
+        )
@@ -4,14 +4,18 @@
 """Tests for filters."""
 
 import contextlib
+import importlib.util
+import json
 import logging
 import os
+import subprocess
 import sys
+import zipfile
 
 import pytest
-from enchant.tokenize import get_tokenizer
+from enchant.tokenize import EmailFilter, URLFilter, WikiWordFilter, get_tokenizer
 
-from sphinxcontrib.spelling import filters  # isort:skip
+from sphinxcontrib.spelling import filters, wordset  # isort:skip
 from tests import helpers  # isort:skip
 
 # Replace the sphinx logger with a normal one so pytest can collect
@@ -83,6 +87,40 @@ def test_contributors(name):
     assert f._skip(name)
 
 
+@helpers.require_git_repo
+def test_contributors_cache(tmpdir):
+    cache_filename = str(tmpdir.join("contributors.json"))
+    f = filters.ContributorFilterFactory(cache_filename=cache_filename)
+    assert "Doug" in f.words
+    with open(cache_filename) as cache_file:
+        cached = json.load(cache_file)
+    head = cached["head"]
+
+    # An unchanged HEAD uses the cached names without scanning.
+    cached["names"] = ["Cached"]
+    with open(cache_filename, "w") as cache_file:
+        json.dump(cached, cache_file)
+    f = filters.ContributorFilterFactory(cache_filename=cache_filename)
+    assert f.words == {"Cached"}
+
+    # When HEAD moves forward, the new commits are added to the
+    # cached names.
+    parent = subprocess.run(
+        ["git", "rev-parse", "--verify", "--quiet", f"{head}~1"],
+        stdout=subprocess.PIPE,
+    )
+    if parent.returncode != 0:
+        pytest.skip("HEAD has no parent commit")
+    cached["head"] = parent.stdout.decode("utf-8").strip()
+    with open(cache_filename, "w") as cache_file:
+        json.dump(cached, cache_file)
+    f = filters.ContributorFilterFactory(cache_filename=cache_filename)
+    assert "Cached" in f.words
+    assert len(f.words) > 1
+    with open(cache_filename) as cache_file:
+        assert json.load(cache_file)["head"] == head
+
+
 @pytest.mark.parametrize(
     "word,expected",
     [
@@ -148,7 +186,323 @@ def test_importable_module_with_system_exit(tmpdir):
     assert "mytestmodule" in f.found_modules
 
 
+@pytest.mark.parametrize(
+    "word,expected",
+    [
+        ("os", True),
+        ("os.path", True),
+        ("os.name", False),
+        ("__main__", False),
+        ("don't", False),
+        ("sphinxcontrib.spelling.py", True),
+    ],
+)
+def test_importable_module_index_skip(word, expected):
+    f = filters.ImportableModuleFilterFactory()(None)
+    assert f._skip(word) is expected
+
+
+def test_importable_module_index_no_side_effects(tmpdir):
+    parentdir = tmpdir.join("parent")
+    parentdir.mkdir()
+
+    parentdir.join("__init__.py").write('raise SystemExit("exit as side-effect")\n')
+    parentdir.join("child.py").write("")
+
+    with import_path([str(tmpdir)] + sys.path):
+        f = filters.ImportableModuleFilterFactory()(None)
+
+    # Nothing is imported to build the index, so the child module is
+    # found, too.
+    assert f._skip("parent") is True
+    assert f._skip("parent.child") is True
+    assert f._skip("parent.other") is False
+
+
+def test_importable_module_index_cache(tmpdir):
+    moduledir = tmpdir.join("modules")
+    moduledir.mkdir()
+    moduledir.join("firstmodule.py").write("")
+    cache_filename = str(tmpdir.join("cache", "modules.wordset"))
+
+    with import_path([str(moduledir)] + sys.path):
+        f = filters.ImportableModuleFilterFactory(cache_filename=cache_filename)
+        assert "firstmodule" in f.module_names
+        assert os.path.exists(cache_filename)
+
+        # Adding a module changes the directory, so the index is
+        # built again.
+        moduledir.join("secondmodule.py").write("")
+        os.utime(str(moduledir), (0, 0))
+        f = filters.ImportableModuleFilterFactory(cache_filename=cache_filename)
+        assert "firstmodule" in f.module_names
+        assert "secondmodule" in f.module_names
+
+
+# A finder like the ones setuptools writes for editable installs,
+# which only has find_spec() and cannot list its modules.
+_EDITABLE_FINDER = """
+import importlib.util
+import os
+import sys
+
+MAPPING = {"editablepkg": %r}
+
+
+class EditableFinder:
+    @classmethod
+    def find_spec(cls, fullname, path=None, target=None):
+        parent, _, child = fullname.rpartition(".")
+        if parent or fullname not in MAPPING:
+            return None
+        location = os.path.join(MAPPING[fullname], "__init__.py")
+        return importlib.util.spec_from_file_location(
+            fullname, location, submodule_search_locations=[MAPPING[fullname]]
+        )
+"""
+
+
+@pytest.fixture
+def editable_finder(tmpdir, monkeypatch):
+    srcdir = tmpdir.join("src", "editablepkg")
+    srcdir.ensure(dir=True)
+    srcdir.join("__init__.py").write('raise SystemExit("exit as side-effect")\n')
+    srcdir.join("child.py").write("")
+    finder_path = tmpdir.join("editable_finder.py")
+    finder_path.write(_EDITABLE_FINDER % str(srcdir))
+
+    spec = importlib.util.spec_from_file_location("editable_finder", finder_path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "editable_finder", module)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(sys, "meta_path", sys.meta_path + [module.EditableFinder])
+    return module
+
+
+def test_importable_module_index_editable_finder(editable_finder):
+    f = filters.ImportableModuleFilterFactory()(None)
+
+    assert f._skip("editablepkg") is True
+    assert f._skip("editablepkg.child") is True
+    assert f._skip("editablepkg.other") is False
+    assert "editablepkg" not in sys.modules
+
+
+def test_importable_module_index_unlisted_finder(editable_finder, monkeypatch):
+    # Without a mapping to read, the finder is asked about each name.
+    monkeypatch.setattr(editable_finder.EditableFinder, "__module__", "unknown")
+    f = filters.ImportableModuleFilterFactory()(None)
+
+    assert "editablepkg" not in f.module_names.collections[0]
+    assert f._skip("editablepkg") is True
+    assert f._skip("editablepkg.child") is False
+    assert "editablepkg" not in sys.modules
+
+
+def test_importable_module_index_zip(tmpdir):
+    archive = str(tmpdir.join("modules.zip"))
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("zippedmodule.py", "")
+
+    with import_path([archive] + sys.path):
+        f = filters.ImportableModuleFilterFactory()(None)
+
+    assert f._skip("zippedmodule") is True
+
+
 def test_pypi_filter_factory():
     f = filters.PyPIFilterFactory()
     assert "sphinxcontrib-spelling" in f.words
     assert "setuptools" in f.words
+
+
+def test_pypi_filter_factory_names_file(tmpdir):
+    names = tmpdir.join("names.txt")
+    names.write("sphinxcontrib-spelling\nsetuptools\n")
+    f = filters.PyPIFilterFactory(names_filename=str(names))
+    assert len(f.words) == 2
+    assert "sphinxcontrib-spelling" in f.words
+    assert "setuptools" in f.words
+
+
+class FakeResponse:
+    "A response from the PyPI simple index, without a network."
+
+    def __init__(self, status_code=200, names=(), headers=None):
+        self.status_code = status_code
+        self.names = names
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"projects": [{"name": name} for name in self.names]}
+
+
+def test_pypi_filter_factory_cache(tmpdir, monkeypatch):
+    cache_filename = str(tmpdir.join("cache", "pypi-names.txt"))
+    requests_made = []
+
+    def fetch(url, headers, timeout):
+        requests_made.append(headers)
+        return FakeResponse(
+            names=["sphinxcontrib-spelling", "setuptools"],
+            headers={"etag": "abc", "last-modified": "yesterday"},
+        )
+
+    monkeypatch.setattr(filters.requests, "get", fetch)
+    f = filters.PyPIFilterFactory(cache_filename=cache_filename)
+    assert sorted(f.words) == ["setuptools", "sphinxcontrib-spelling"]
+    assert "if-none-match" not in requests_made[0]
+    with open(cache_filename + ".json", encoding="utf-8") as fd:
+        metadata = json.load(fd)
+    assert metadata["etag"] == "abc"
+    assert metadata["last_modified"] == "yesterday"
+
+    # A fresh cache is used without going to the network.
+    f = filters.PyPIFilterFactory(cache_filename=cache_filename)
+    assert sorted(f.words) == ["setuptools", "sphinxcontrib-spelling"]
+    assert len(requests_made) == 1
+
+
+def test_pypi_filter_factory_revalidate(tmpdir, monkeypatch):
+    cache_filename = str(tmpdir.join("pypi-names.txt"))
+    wordset.WordSet.from_words(["sphinxcontrib-spelling", "setuptools"]).save(
+        cache_filename
+    )
+    tmpdir.join("pypi-names.txt.json").write(
+        '{"fetched": 0, "etag": "abc", "last_modified": "yesterday"}'
+    )
+
+    def not_modified(url, headers, timeout):
+        assert headers["if-none-match"] == "abc"
+        assert headers["if-modified-since"] == "yesterday"
+        return FakeResponse(304, headers={"etag": "abc"})
+
+    monkeypatch.setattr(filters.requests, "get", not_modified)
+    inode = os.stat(cache_filename).st_ino
+    f = filters.PyPIFilterFactory(cache_filename=cache_filename, ttl=60)
+    assert sorted(f.words) == ["setuptools", "sphinxcontrib-spelling"]
+    # Only the metadata is written again, not the mapped names.
+    assert os.stat(cache_filename).st_ino == inode
+    # The cached names are current again, so the next build does
+    # not ask.
+    with open(cache_filename + ".json", encoding="utf-8") as fd:
+        assert json.load(fd)["fetched"] > 0
+
+    def fail(*args, **kwds):
+        raise AssertionError("should not download names")
+
+    monkeypatch.setattr(filters.requests, "get", fail)
+    f = filters.PyPIFilterFactory(cache_filename=cache_filename, ttl=60)
+    assert sorted(f.words) == ["setuptools", "sphinxcontrib-spelling"]
+
+
+def test_pypi_filter_factory_unchanged_names(tmpdir, monkeypatch):
+    cache_filename = str(tmpdir.join("pypi-names.txt"))
+    wordset.WordSet.from_words(["sphinxcontrib-spelling", "setuptools"]).save(
+        cache_filename
+    )
+    tmpdir.join("pypi-names.txt.json").write('{"fetched": 0}')
+
+    def fetch(url, headers, timeout):
+        return FakeResponse(
+            names=["setuptools", "sphinxcontrib-spelling"], headers={"etag": "def"}
+        )
+
+    monkeypatch.setattr(filters.requests, "get", fetch)
+    inode = os.stat(cache_filename).st_ino
+    f = filters.PyPIFilterFactory(cache_filename=cache_filename)
+    assert sorted(f.words) == ["setuptools", "sphinxcontrib-spelling"]
+    assert os.stat(cache_filename).st_ino == inode
+    with open(cache_filename + ".json", encoding="utf-8") as fd:
+        assert json.load(fd)["etag"] == "def"
+
+
+def test_pypi_filter_factory_stale_cache_offline(tmpdir, monkeypatch):
+    cache_filename = str(tmpdir.join("pypi-names.txt"))
+    wordset.WordSet.from_words(["sphinxcontrib-spelling", "setuptools"]).save(
+        cache_filename
+    )
+    tmpdir.join("pypi-names.txt.json").write('{"fetched": 0, "etag": "abc"}')
+
+    def offline(*args, **kwds):
+        assert kwds["headers"]["if-none-match"] == "abc"
+        raise filters.requests.ConnectionError("offline")
+
+    monkeypatch.setattr(filters.requests, "get", offline)
+    f = filters.PyPIFilterFactory(cache_filename=cache_filename)
+    assert sorted(f.words) == ["setuptools", "sphinxcontrib-spelling"]
+
+
+def test_ignore_words_filter_compact():
+    t = get_tokenizer("en_US", [])
+    factory = filters.IgnoreWordsFilterFactory(["teh", "txt"], compact=True)
+    assert isinstance(factory.words, wordset.WordSet)
+    words = [w[0] for w in factory(t)("teh txt is wrong")]
+    assert words == ["is", "wrong"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_ignore_words_filter_digest(compact):
+    digest = filters.IgnoreWordsFilterFactory(["teh", "txt"], compact).digest()
+    assert filters.IgnoreWordsFilterFactory(["txt", "teh"], compact).digest() == digest
+    assert filters.IgnoreWordsFilterFactory(["teh"], compact).digest() != digest
+
+
+CHAIN_TEXT = """
+It's a "front-end" for DBM-style databases (and URLs) that can't, won't,
+or doesn't use os.path, len() or json; see someone@example.com, the
+WikiWord page, and https://example.com/page. John's o'clock naïve été
+'quoted' words, setup.py, foo_bar, x-y, ab12cd, 123, and ignored ones.
+"""
+
+CHAIN_FILTERS = [
+    filters.ContractionFilter,
+    EmailFilter,
+    WikiWordFilter,
+    URLFilter,
+    filters.AcronymFilter,
+    filters.PythonBuiltinsFilter,
+    filters.IgnoreWordsFilterFactory(["ignored", "can"]),
+]
+
+
+@pytest.mark.parametrize("lang", ["en_US", "de_DE"])
+@pytest.mark.parametrize(
+    "filter_list",
+    [[], CHAIN_FILTERS[:1], CHAIN_FILTERS, CHAIN_FILTERS[::-1]],
+)
+def test_filter_chain_matches_tokenizer(lang, filter_list):
+    chain = filters.FilterChain.from_filters(lang, filter_list)
+    expected = list(get_tokenizer(lang, filters=filter_list)(CHAIN_TEXT))
+    assert list(chain(CHAIN_TEXT)) == expected
+
+
+def test_filter_chain_with_filters():
+    chain = filters.FilterChain.from_filters("en_US", CHAIN_FILTERS)
+    added = [filters.IgnoreWordsFilterFactory(["path", "databases"])]
+    tokenizer = get_tokenizer("en_US", filters=CHAIN_FILTERS)
+    for f in added:
+        tokenizer = f(tokenizer)
+    expected = list(tokenizer(CHAIN_TEXT))
+    assert list(chain.with_filters(added)(CHAIN_TEXT)) == expected
+    assert "databases" in [word for word, pos in chain(CHAIN_TEXT)]
+
+
+def test_filter_chain_custom_filter():
+    class CustomFilter(filters.Filter):
+        def _skip(self, word):
+            return word == "the"
+
+    assert filters.FilterChain.from_filters("en_US", [CustomFilter]) is None
+    chain = filters.FilterChain.from_filters("en_US", CHAIN_FILTERS)
+    assert chain.with_filters([CustomFilter]) is None
+
+
+def test_contraction_filter_repeated():
+    # The words a contraction is split into are not used up.
+    tokenizer = get_tokenizer("en_US", filters=[filters.ContractionFilter])
+    words = [word for word, pos in tokenizer("can't can't")]
+    assert words == ["can", "not", "can", "not"]
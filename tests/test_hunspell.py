@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2010 Doug Hellmann.  All rights reserved.
+#
+"""Tests for reading Hunspell dictionaries"""
+
+import textwrap
+
+from sphinxcontrib.spelling import hunspell
+
+
+def write(tmpdir, filename, content):
+    path = tmpdir.join(filename)
+    path.write_text(textwrap.dedent(content).lstrip(), encoding="utf-8")
+    return str(path)
+
+
+def test_expand_affixes(tmpdir):
+    write(
+        tmpdir,
+        "test.aff",
+        """
+        SET UTF-8
+        NEEDAFFIX X
+        FORBIDDENWORD F
+
+        PFX A Y 1
+        PFX A   0     re         .
+
+        SFX D Y 3
+        SFX D   0     d          e
+        SFX D   y     ied        [^aeiou]y
+        SFX D   0     ed         [^ey]
+
+        SFX S N 1
+        SFX S   y     ies        [^aeiou]y
+        """,
+    )
+    dic = write(
+        tmpdir,
+        "test.dic",
+        """
+        5
+        work/AD
+        carry/DS
+        bake/D
+        stem/X
+        bad/F
+        and\\/or
+        """,
+    )
+    assert sorted(hunspell.read_words(dic)) == [
+        "and/or",
+        "bake",
+        "baked",
+        "carried",
+        "carries",
+        "carry",
+        "rework",
+        "reworked",
+        "work",
+        "worked",
+    ]
+
+
+def test_long_flags(tmpdir):
+    write(
+        tmpdir,
+        "test.aff",
+        """
+        FLAG long
+
+        SFX Aa Y 1
+        SFX Aa  0     s          .
+        """,
+    )
+    dic = write(tmpdir, "test.dic", "1\nword/Aa\n")
+    assert sorted(hunspell.read_words(dic)) == ["word", "words"]
+
+
+def test_flag_aliases(tmpdir):
+    write(
+        tmpdir,
+        "test.aff",
+        """
+        AF 1
+        AF S
+
+        SFX S Y 1
+        SFX S   0     s          .
+        """,
+    )
+    dic = write(tmpdir, "test.dic", "1\nword/1\n")
+    assert sorted(hunspell.read_words(dic)) == ["word", "words"]
+
+
+def test_morphological_fields_ignored(tmpdir):
+    dic = write(tmpdir, "test.dic", "1\nword\tpo:noun\n")
+    assert list(hunspell.read_words(dic)) == ["word"]
+
+
+def test_word_list(tmpdir):
+    filename = write(
+        tmpdir,
+        "words.txt",
+        """
+        # comment
+        alpha
+
+        beta
+        """,
+    )
+    assert list(hunspell.read_words(filename)) == ["alpha", "beta"]
@@ -0,0 +1,65 @@
+#
+# Copyright (c) 2010 Doug Hellmann.  All rights reserved.
+#
+"""Tests for consolidated reports"""
+
+import json
+import os
+
+import pytest
+
+from sphinxcontrib.spelling import report
+
+RECORDS = [
+    {
+        "document": "contents",
+        "source": os.path.join("src", "contents.rst"),
+        "line": 3,
+        "word": "teh",
+        "suggestions": ["the", "tea"],
+        "context": "teh is not ok",
+    },
+    {
+        "document": "other",
+        "source": os.path.join("src", "other.rst"),
+        "line": None,
+        "word": "whaat",
+        "suggestions": [],
+        "context": "",
+    },
+]
+
+
+@pytest.mark.parametrize("name", ["jsonl", "sarif"])
+def test_round_trip(tmpdir, name):
+    r = report.FORMATS[name](str(tmpdir))
+    r.save(RECORDS)
+    assert r.load() == RECORDS
+
+
+@pytest.mark.parametrize("name", ["jsonl", "sarif"])
+def test_load_missing(tmpdir, name):
+    r = report.FORMATS[name](str(tmpdir))
+    assert r.load() == []
+
+
+def test_jsonl_one_record_per_line(tmpdir):
+    r = report.JSONLinesReport(str(tmpdir))
+    r.save(RECORDS)
+    with open(r.filename) as f:
+        lines = f.readlines()
+    assert [json.loads(line) for line in lines] == RECORDS
+
+
+def test_sarif(tmpdir):
+    r = report.SARIFReport(str(tmpdir))
+    r.save(RECORDS)
+    with open(r.filename) as f:
+        log = json.load(f)
+    assert log["version"] == "2.1.0"
+    results = log["runs"][0]["results"]
+    assert len(results) == 2
+    location = results[0]["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "src/contents.rst"
+    assert location["region"] == {"startLine": 3}
+    assert "region" not in results[1]["locations"][0]["physicalLocation"]
@@ -0,0 +1,124 @@
+#
+# Copyright (c) 2010 Doug Hellmann.  All rights reserved.
+#
+"""Tests for the precomputed suggestion index"""
+
+import os
+
+import pytest
+
+from sphinxcontrib.spelling import symspell
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ("", "", 0),
+        ("abc", "abc", 0),
+        ("abcd", "acbd", 1),
+        ("abc", "ab", 1),
+        ("ab", "abc", 1),
+        ("abc", "axc", 1),
+        ("kitten", "sitting", 3),
+        ("ca", "abc", 3),
+    ],
+)
+def test_distance(a, b, expected):
+    assert symspell.distance(a, b, 5) == expected
+
+
+def test_distance_limit():
+    assert symspell.distance("kitten", "sitting", 2) == 3
+    assert symspell.distance("a", "abcdef", 2) == 3
+
+
+def test_deletes():
+    assert symspell.deletes("abc", 1) == {"abc", "ab", "ac", "bc"}
+
+
+def test_suggest():
+    index = symspell.SuggestionIndex.from_words(["the", "tea", "ten", "they", "cat"])
+    suggestions = index.suggest("teh")
+    assert suggestions[0] == "the"
+    assert "cat" not in suggestions
+
+
+def test_suggest_limit():
+    index = symspell.SuggestionIndex.from_words(["the", "tea", "ten", "they"], limit=2)
+    assert len(index.suggest("teh")) == 2
+
+
+def test_suggest_title_case():
+    index = symspell.SuggestionIndex.from_words(["the", "tea"])
+    assert index.suggest("Teh")[0] == "The"
+
+
+def test_suggest_long_word():
+    # Letters past the prefix length are compared, but not indexed.
+    index = symspell.SuggestionIndex.from_words(["internationalization"])
+    assert index.suggest("internationalisation") == ["internationalization"]
+    assert index.suggest("internationalizations") == ["internationalization"]
+
+
+def test_save_and_load(tmpdir):
+    filename = str(tmpdir.join("words.index"))
+    words = ["the", "tea", "ten", "they", "naïve"]
+    symspell.SuggestionIndex.from_words(words).save(filename)
+    index = symspell.SuggestionIndex.load(filename)
+    assert len(index) == len(words)
+    assert index.suggest("teh")[0] == "the"
+    assert index.suggest("naive") == ["naïve"]
+
+
+def test_load_not_an_index(tmpdir):
+    filename = tmpdir.join("words.index")
+    filename.write_binary(b"not an index")
+    with pytest.raises(ValueError):
+        symspell.SuggestionIndex.load(str(filename))
+
+
+def test_load_truncated_index(tmpdir):
+    filename = str(tmpdir.join("words.index"))
+    symspell.SuggestionIndex.from_words(["the", "tea", "ten"]).save(filename)
+    with open(filename, "rb") as f:
+        data = f.read()
+    with open(filename, "wb") as f:
+        f.write(data[: symspell.SuggestionIndex._header.size + 10])
+    with pytest.raises(ValueError):
+        symspell.SuggestionIndex.load(filename)
+
+
+def test_from_files_truncated_cache(tmpdir):
+    word_list = tmpdir.join("words.txt")
+    word_list.write_text("the\ntea\n", encoding="utf-8")
+    cache_dir = tmpdir.join("cache")
+    symspell.SuggestionIndex.from_files([str(word_list)], cache_dir=str(cache_dir))
+    (cache_file,) = cache_dir.listdir()
+    cache_file.write_binary(cache_file.read_binary()[:100])
+
+    index = symspell.SuggestionIndex.from_files(
+        [str(word_list)], cache_dir=str(cache_dir)
+    )
+    assert index.suggest("teh") == ["the", "tea"]
+
+
+def test_from_files_cached(tmpdir):
+    word_list = tmpdir.join("words.txt")
+    word_list.write_text("the\ntea\n", encoding="utf-8")
+    cache_dir = str(tmpdir.join("cache"))
+    index = symspell.SuggestionIndex.from_files(
+        [str(word_list), None], cache_dir=cache_dir
+    )
+    assert index.suggest("teh") == ["the", "tea"]
+    (cache_file,) = os.listdir(cache_dir)
+    assert cache_file.startswith("suggestions-")
+
+    again = symspell.SuggestionIndex.from_files([str(word_list)], cache_dir=cache_dir)
+    assert again.suggest("teh") == ["the", "tea"]
+    assert again.cache_key == index.cache_key
+
+    # Changing the words makes a new index.
+    word_list.write_text("the\nten\n", encoding="utf-8")
+    changed = symspell.SuggestionIndex.from_files([str(word_list)], cache_dir=cache_dir)
+    assert changed.suggest("teh") == ["the", "ten"]
+    assert changed.cache_key != index.cache_key
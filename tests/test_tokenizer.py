@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2010 Doug Hellmann.  All rights reserved.
+#
+"""Tests for the regular expression tokenizer"""
+
+import random
+
+import pytest
+from enchant.tokenize import de as tokenize_de
+from enchant.tokenize import en as tokenize_en
+from enchant.tokenize import get_tokenizer
+
+from sphinxcontrib.spelling import filters, tokenizer  # isort:skip
+
+LANGUAGES = [("en_US", tokenize_en.tokenize), ("de_DE", tokenize_de.tokenize)]
+
+SAMPLES = [
+    "",
+    "word",
+    "Two words",
+    "It's John's o'clock, isn't it?",
+    "'quoted' ''double'' trailing'' -dash- x-y a--b a.b.c end.",
+    "front-end os.path foo_bar ab12cd 123 v2.0 e.g. i.e.",
+    "tabs\tand\nnewlines\r\nand  spaces",
+    "naïve café résumé Ærøskøbing straße",
+    "combining: café ét́e a'́ ́x",
+    "numerals: x² ½ Ⅻ ٣ a١b",
+    'punctuation: (a) [b] {c} <d> "e" `f` g! h? i; j: k,',
+]
+
+PIECES = [
+    "a",
+    "Z",
+    "é",
+    "́",
+    "'",
+    "-",
+    ".",
+    "_",
+    "1",
+    "²",
+    " ",
+    "\n",
+    "x",
+    "ab",
+    "(",
+    "@",
+]
+
+
+def random_samples(count=300, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 20)))
+
+
+@pytest.mark.parametrize("lang,expected_tokenizer", LANGUAGES)
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_enchant(lang, expected_tokenizer, text):
+    regex_tokenizer = tokenizer.RegexTokenizer(lang)
+    assert list(regex_tokenizer(text)) == list(expected_tokenizer(text))
+
+
+@pytest.mark.parametrize("lang,expected_tokenizer", LANGUAGES)
+def test_matches_enchant_random(lang, expected_tokenizer):
+    regex_tokenizer = tokenizer.RegexTokenizer(lang)
+    for text in random_samples():
+        assert list(regex_tokenizer(text)) == list(expected_tokenizer(text)), text
+
+
+@pytest.mark.parametrize("lang,expected_tokenizer", LANGUAGES)
+def test_wrap_matches_get_tokenizer(lang, expected_tokenizer):
+    filter_list = [filters.ContractionFilter, filters.AcronymFilter]
+    wrapped = tokenizer.RegexTokenizer(lang).wrap(filter_list)
+    expected = get_tokenizer(lang, filters=filter_list)
+    for text in SAMPLES + list(random_samples()):
+        assert list(wrapped(text)) == list(expected(text)), text
+
+
+@pytest.mark.parametrize("lang,expected_tokenizer", LANGUAGES)
+def test_filter_chain_matches_get_tokenizer(lang, expected_tokenizer):
+    filter_list = [filters.ContractionFilter, filters.PythonBuiltinsFilter]
+    chain = filters.FilterChain.from_filters(
+        lang, filter_list, tokenizer.RegexTokenizer(lang)
+    )
+    expected = get_tokenizer(lang, filters=filter_list)
+    for text in SAMPLES + list(random_samples()):
+        assert list(chain(text)) == list(expected(text)), text
+
+
+def test_language_variant():
+    assert tokenizer.RegexTokenizer("en-GB").fallback is tokenize_en.tokenize
+
+
+def test_unknown_language():
+    with pytest.raises(ValueError):
+        tokenizer.RegexTokenizer("xx_XX")
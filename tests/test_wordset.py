@@ -0,0 +1,78 @@
+"""Tests for WordSet."""
+
+import pytest
+
+from sphinxcontrib.spelling.wordset import WordSet
+
+
+def test_contains():
+    words = WordSet.from_words(["setuptools", "sphinxcontrib-spelling", "passé"])
+    assert len(words) == 3
+    assert "setuptools" in words
+    assert "passé" in words
+    assert "passe" not in words
+    assert "" not in words
+    assert None not in words
+
+
+def test_contains_many():
+    words = WordSet.from_words(["setuptools", "passé"])
+    assert words.contains_many(["passé", "passe", "", None, "setuptools"]) == [
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_empty():
+    words = WordSet.from_words([])
+    assert len(words) == 0
+    assert "anything" not in words
+    assert list(words) == []
+
+
+def test_duplicates():
+    words = WordSet.from_words(["b", "a", "b", "a"])
+    assert sorted(words) == ["a", "b"]
+
+
+def test_save_and_load(tmpdir):
+    filename = str(tmpdir.join("words.wordset"))
+    names = [f"package-{i}" for i in range(1000)]
+    WordSet.from_words(names).save(filename)
+
+    words = WordSet.load(filename)
+    assert len(words) == 1000
+    assert all(name in words for name in names)
+    assert "package-1000" not in words
+    assert sorted(words) == sorted(names)
+
+
+def test_digest(tmpdir):
+    filename = str(tmpdir.join("words.wordset"))
+    words = WordSet.from_words(["ab", "c"])
+    words.save(filename)
+    assert WordSet.load(filename).digest() == words.digest()
+    assert WordSet.from_words(["c", "ab", "c"]).digest() == words.digest()
+    assert WordSet.from_words(["a", "bc"]).digest() != words.digest()
+
+
+def test_load_invalid_file(tmpdir):
+    filename = tmpdir.join("words.txt")
+    filename.write("not a word set file, just some text\n" * 4)
+    with pytest.raises(ValueError):
+        WordSet.load(str(filename))
+
+
+@pytest.mark.parametrize("size", [0, 10, 60])
+def test_load_truncated_file(tmpdir, size):
+    filename = str(tmpdir.join("words.wordset"))
+    WordSet.from_words([f"package-{i}" for i in range(100)]).save(filename)
+    with open(filename, "rb") as f:
+        data = f.read()
+    with open(filename, "wb") as f:
+        f.write(data[:size])
+    with pytest.raises(ValueError):
+        WordSet.load(filename)